@@ -1,11 +1,17 @@
 """
 Project Builder - Orchestrates multi-level analysis and builds hierarchical project graph
 """
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
+from typing import NamedTuple, Dict, List, Optional, Set, Any
 import logging
-import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import re
+import threading
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from models.project_model import ProjectGraph, CodeElement, CodeLocation, NodeType, Scope
 from language_detector import LanguageDetector, Language
@@ -14,21 +20,67 @@ from cache_manager import CacheManager
 
 logger = logging.getLogger(__name__)
 
+# Builds run on request and build threads; process pool workers must not be
+# forked from them (inherited locks and sockets), so start them fresh
+_POOL_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+
+@dataclass(frozen=True, slots=True)
+class CachedAnalysis:
+    """Per-file analysis used to build the project graph (cached or freshly analyzed)."""
+    file_path: str
+    language: str
+    classes: List[str]
+    functions: List[str]
+    variables: List[str]
+    imports: List[str]
+    complexity: float
+    lines_of_code: int
+    hash: str = ''
+    ast_nodes: List[Dict] = field(default_factory=list)  # Old FileAnalysis format only
+    
+    @property
+    def lines(self) -> int:
+        """Alias matching UniversalFileAnalysis.lines."""
+        return self.lines_of_code
+
+
+class FileRecord(NamedTuple):
+    """A discovered file, with the path data every build stage needs computed once."""
+    path: Path
+    name: str
+    suffix: str
+    rel: str  # Path relative to the project root
+    language: Language
+    size: int
+    mtime_ns: int
+
 
 class HierarchyAnalyzer:
     """Analyzes project hierarchy and package structure."""
     
-    def analyze_file_hierarchy(self, files: List[Path], root_path: Path) -> Dict[str, CodeElement]:
+    # Files that mark their directory as a package/module
+    PACKAGE_MARKER_FILES = frozenset({
+        '__init__.py',                            # Python
+        'package.json', 'index.js', 'index.ts',   # JavaScript/TypeScript
+        'go.mod',                                 # Go
+        'Cargo.toml', 'lib.rs', 'main.rs',        # Rust
+    })
+    
+    def analyze_file_hierarchy(self, files: List[FileRecord], root_path: Path) -> Dict[str, CodeElement]:
         """Build file and package hierarchy."""
         elements = {}
+        # Relative path strings per directory, shared by every lookup below
+        rel_dirs: Dict[Path, str] = {}
         
         # Group files by directory to identify packages/modules
         dir_files = {}
-        for file_path in files:
-            dir_path = file_path.parent
+        for record in files:
+            dir_path = record.path.parent
             if dir_path not in dir_files:
                 dir_files[dir_path] = []
-            dir_files[dir_path].append(file_path)
+            dir_files[dir_path].append(record)
         
         # Create directory/package elements
         for dir_path, dir_files_list in dir_files.items():
@@ -39,7 +91,7 @@ class HierarchyAnalyzer:
             is_package = self._is_package_directory(dir_path, dir_files_list)
             
             if is_package:
-                package_id = f"package:{dir_path.relative_to(root_path)}"
+                package_id = f"package:{self._relative_dir(dir_path, root_path, rel_dirs)}"
                 package_element = CodeElement(
                     id=package_id,
                     name=dir_path.name,
@@ -52,73 +104,85 @@ class HierarchyAnalyzer:
                         col_start=0,
                         col_end=0
                     ),
-                    parent_id=self._get_parent_package_id(dir_path, root_path),
+                    parent_id=self._get_parent_package_id(dir_path, root_path, rel_dirs),
                     lines_of_code=0,
                     properties={'directory_path': str(dir_path)}
                 )
                 elements[package_id] = package_element
         
         # Create file elements
-        for file_path in files:
-            file_id = f"file:{file_path.relative_to(root_path)}"
-            language = LanguageDetector.detect_language(file_path)
+        for record in files:
+            file_id = f"file:{record.rel}"
             
             file_element = CodeElement(
                 id=file_id,
-                name=file_path.name,
+                name=record.name,
                 type=NodeType.FILE,
-                language=language.value,
+                language=record.language.value,
                 location=CodeLocation(
-                    file_path=str(file_path.relative_to(root_path)),
+                    file_path=record.rel,
                     line_start=1,
                     line_end=1,  # Will be updated with actual line count
                     col_start=0,
                     col_end=0
                 ),
-                parent_id=self._get_parent_package_id(file_path.parent, root_path),
-                properties={'absolute_path': str(file_path)}
+                parent_id=self._get_parent_package_id(record.path.parent, root_path, rel_dirs),
+                properties={'absolute_path': str(record.path)}
             )
             elements[file_id] = file_element
         
         return elements
     
-    def _is_package_directory(self, dir_path: Path, files: List[Path]) -> bool:
+    def _is_package_directory(self, dir_path: Path, files: List[FileRecord]) -> bool:
         """Determine if directory represents a package/module."""
-        # Python: has __init__.py
-        if any(f.name == '__init__.py' for f in files):
-            return True
-        
-        # JavaScript/TypeScript: has package.json or index.js/ts
-        if any(f.name in ['package.json', 'index.js', 'index.ts'] for f in files):
-            return True
-        
-        # Go: has go.mod or multiple .go files
-        if any(f.name == 'go.mod' for f in files) or len([f for f in files if f.suffix == '.go']) >= 2:
-            return True
-        
-        # Rust: has Cargo.toml or lib.rs/main.rs
-        if any(f.name in ['Cargo.toml', 'lib.rs', 'main.rs'] for f in files):
-            return True
-        
-        # Java: has multiple .java files (package structure)
-        if len([f for f in files if f.suffix == '.java']) >= 2:
-            return True
+        # Single pass, returning at the first definitive marker
+        go_files = java_files = 0
+        for f in files:
+            if f.name in self.PACKAGE_MARKER_FILES:
+                return True
+            
+            # Go and Java: multiple source files (package structure)
+            suffix = f.suffix
+            if suffix == '.go':
+                go_files += 1
+                if go_files >= 2:
+                    return True
+            elif suffix == '.java':
+                java_files += 1
+                if java_files >= 2:
+                    return True
         
         return False
     
-    def _get_parent_package_id(self, dir_path: Path, root_path: Path) -> Optional[str]:
+    def _get_parent_package_id(self, dir_path: Path, root_path: Path,
+                               rel_dirs: Dict[Path, str]) -> Optional[str]:
         """Get parent package ID for a directory."""
         if dir_path == root_path or dir_path.parent == root_path:
             return None
-        return f"package:{dir_path.parent.relative_to(root_path)}"
+        return f"package:{self._relative_dir(dir_path.parent, root_path, rel_dirs)}"
+    
+    def _relative_dir(self, dir_path: Path, root_path: Path, rel_dirs: Dict[Path, str]) -> str:
+        """Return str(dir_path.relative_to(root_path)), memoized in rel_dirs."""
+        relative = rel_dirs.get(dir_path)
+        if relative is None:
+            # Slice the root prefix off the string form instead of building PurePaths
+            root_prefix = os.path.join(str(root_path), '')
+            dir_str = str(dir_path)
+            if dir_str.startswith(root_prefix):
+                relative = dir_str[len(root_prefix):]
+            else:
+                relative = str(dir_path.relative_to(root_path))
+            rel_dirs[dir_path] = relative
+        return relative
 
 
 class DependencyAnalyzer:
     """Analyzes dependencies between code elements."""
     
-    def analyze_dependencies(self, elements: Dict[str, CodeElement], 
+    def analyze_dependencies(self, project_graph: ProjectGraph, 
                            file_analyses: Dict[str, UniversalFileAnalysis]) -> None:
-        """Analyze and populate dependency relationships."""
+        """Analyze and populate dependency relationships of the graph's elements."""
+        elements = project_graph.elements
         
         # Build name-to-element mappings for faster lookup
         element_by_name = self._build_name_mappings(elements)
@@ -126,9 +190,9 @@ class DependencyAnalyzer:
         for element in elements.values():
             if element.type == NodeType.FILE:
                 # Analyze file-level dependencies
-                file_analysis = file_analyses.get(element.location.file_path)
+                file_analysis = _file_analysis_for(element, file_analyses)
                 if file_analysis:
-                    self._analyze_file_dependencies(element, file_analysis, element_by_name)
+                    self._analyze_file_dependencies(element, file_analysis, project_graph, element_by_name)
             
             elif element.type in [NodeType.CLASS, NodeType.FUNCTION, NodeType.METHOD]:
                 # Analyze code element dependencies
@@ -136,55 +200,40 @@ class DependencyAnalyzer:
     
     def _build_name_mappings(self, elements: Dict[str, CodeElement]) -> Dict[str, List[str]]:
         """Build mappings from names to element IDs."""
-        mappings = {}
+        mappings = defaultdict(list)
         
         for element_id, element in elements.items():
-            if element.name not in mappings:
-                mappings[element.name] = []
             mappings[element.name].append(element_id)
+            if element.type == NodeType.FILE:
+                # Imports name modules, not files: "import utils" means utils.py
+                stem = os.path.splitext(element.name)[0]
+                if stem != element.name:
+                    mappings[stem].append(element_id)
         
         return mappings
     
     def _analyze_file_dependencies(self, file_element: CodeElement, 
                                  file_analysis: UniversalFileAnalysis,
+                                 project_graph: ProjectGraph,
                                  element_by_name: Dict[str, List[str]]) -> None:
         """Analyze dependencies for a file element."""
+        all_elements = project_graph.elements
+        known_names = element_by_name.keys()
         for import_stmt in file_analysis.imports:
-            # Extract module/file name from import statement
-            imported_names = self._extract_imported_names(import_stmt, file_analysis.language)
+            # Extract module/file name from import statement, keeping only known names
+            matched_names = known_names & set(self._extract_imported_names(import_stmt, file_analysis.language))
             
-            for name in imported_names:
-                # Find corresponding elements
-                if name in element_by_name:
-                    for dep_id in element_by_name[name]:
-                        dep_element = file_element  # This would need proper resolution
-                        if dep_element and dep_element.type == NodeType.FILE:
-                            file_element.add_dependency(dep_id)
+            for name in matched_names:
+                # Files depend on the files they import, not on same-named code elements
+                for dep_id in element_by_name[name]:
+                    if dep_id != file_element.id and all_elements[dep_id].type == NodeType.FILE:
+                        project_graph.add_dependency(file_element.id, dep_id)
     
     def _extract_imported_names(self, import_stmt: str, language: str) -> List[str]:
         """Extract imported names from import statement."""
-        names = []
-        
-        if language == 'python':
-            # Handle Python imports: "import module", "from module import name"
-            if import_stmt.startswith('from ') and ' import ' in import_stmt:
-                module_part = import_stmt.split(' import ')[0].replace('from ', '')
-                import_part = import_stmt.split(' import ')[1]
-                names.append(module_part.strip())
-                names.extend([n.strip() for n in import_part.split(',')])
-            elif import_stmt.startswith('import '):
-                module_names = import_stmt.replace('import ', '').split(',')
-                names.extend([n.strip() for n in module_names])
-        
-        elif language in ['javascript', 'typescript']:
-            # Handle JS/TS imports: "import name from 'module'", "require('module')"
-            if 'from ' in import_stmt:
-                module_part = import_stmt.split('from ')[-1].strip().strip("'\"")
-                names.append(module_part)
-        
-        # Add more language-specific import parsing as needed
-        
-        return names
+        # Add more language-specific import parsing to _IMPORT_NAME_PARSERS as needed
+        parser = _IMPORT_NAME_PARSERS.get(language)
+        return parser(import_stmt) if parser else []
     
     def _analyze_code_element_dependencies(self, element: CodeElement, 
                                          all_elements: Dict[str, CodeElement],
@@ -196,55 +245,124 @@ class DependencyAnalyzer:
         pass
 
 
+# Python: "from module import a, b" and "import a, b"
+_PY_FROM_IMPORT = re.compile(r'from\s+(\S+)\s+import\s+(.+)', re.DOTALL)
+_PY_IMPORT = re.compile(r'import\s+(.+)', re.DOTALL)
+# JS/TS: "import name from 'module'"
+_JS_FROM = re.compile(r"""from\s+['"]([^'"]+)['"]""")
+
+
+def _python_imported_names(import_stmt: str) -> List[str]:
+    """Module and imported names of a Python import statement."""
+    match = _PY_FROM_IMPORT.match(import_stmt)
+    if match:
+        return [match.group(1), *[n.strip() for n in match.group(2).split(',')]]
+    match = _PY_IMPORT.match(import_stmt)
+    if match:
+        return [n.strip() for n in match.group(1).split(',')]
+    # Analyzers record imports as dotted names ("pkg.module", "module.name")
+    return import_stmt.split('.')
+
+
+def _js_imported_names(import_stmt: str) -> List[str]:
+    """Source module of a JS/TS import statement."""
+    match = _JS_FROM.search(import_stmt)
+    return [match.group(1)] if match else []
+
+
+_IMPORT_NAME_PARSERS = {
+    'python': _python_imported_names,
+    'javascript': _js_imported_names,
+    'typescript': _js_imported_names,
+}
+
+
 class MetricsAnalyzer:
     """Analyzes code metrics at various levels."""
     
-    def calculate_metrics(self, elements: Dict[str, CodeElement], 
-                         file_analyses: Dict[str, UniversalFileAnalysis]) -> None:
-        """Calculate comprehensive metrics for all elements."""
-        
-        # Calculate file-level metrics
+    CODE_ELEMENT_TYPES = frozenset({NodeType.CLASS, NodeType.FUNCTION, NodeType.METHOD})
+    
+    def calculate_metrics(self, project_graph: ProjectGraph, 
+                         file_analyses: Dict[str, UniversalFileAnalysis],
+                         children_by_parent: Optional[Dict[str, List[CodeElement]]] = None) -> None:
+        """
+        Calculate comprehensive metrics for all elements of the graph.
+        
+        Args:
+            project_graph: Graph whose elements are updated
+            file_analyses: File analyses keyed by file path
+            children_by_parent: Child elements keyed by parent ID, if already built
+        """
+        elements = project_graph.elements
+        if children_by_parent is None:
+            children_by_parent = _index_children(elements)
+        
+        # Bucket elements in one pass
+        files = []
+        packages = []
+        code_elements = []
         for element in elements.values():
             if element.type == NodeType.FILE:
-                file_analysis = file_analyses.get(element.location.file_path)
-                if file_analysis:
-                    element.lines_of_code = file_analysis.lines
-                    element.complexity = file_analysis.complexity
+                files.append(element)
+            elif element.type == NodeType.PACKAGE:
+                packages.append(element)
+            elif element.type in self.CODE_ELEMENT_TYPES:
+                code_elements.append(element)
+        
+        # Calculate file-level metrics
+        for element in files:
+            file_analysis = _file_analysis_for(element, file_analyses)
+            if file_analysis:
+                project_graph.update_element(element.id, lines_of_code=file_analysis.lines,
+                                             complexity=file_analysis.complexity)
         
         # Calculate package-level metrics (aggregate from files)
-        for element in elements.values():
-            if element.type == NodeType.PACKAGE:
-                self._calculate_package_metrics(element, elements)
+        for element in packages:
+            child_files = [child for child in children_by_parent.get(element.id, ())
+                           if child.type == NodeType.FILE]
+            self._calculate_package_metrics(element, child_files, project_graph)
         
         # Calculate class and function metrics
-        for element in elements.values():
-            if element.type in [NodeType.CLASS, NodeType.FUNCTION, NodeType.METHOD]:
-                self._calculate_element_metrics(element, elements)
+        for element in code_elements:
+            self._calculate_element_metrics(element, project_graph)
     
     def _calculate_package_metrics(self, package_element: CodeElement, 
-                                  all_elements: Dict[str, CodeElement]) -> None:
-        """Calculate aggregated metrics for a package."""
-        child_files = [e for e in all_elements.values() 
-                      if e.parent_id == package_element.id and e.type == NodeType.FILE]
-        
-        package_element.lines_of_code = sum(f.lines_of_code for f in child_files)
+                                  child_files: List[CodeElement],
+                                  project_graph: ProjectGraph) -> None:
+        """Calculate aggregated metrics for a package from its direct child files."""
         complexities = [f.complexity for f in child_files if f.complexity]
-        package_element.complexity = sum(complexities) / len(complexities) if complexities else 0
+        project_graph.update_element(
+            package_element.id,
+            lines_of_code=sum(f.lines_of_code for f in child_files),
+            complexity=sum(complexities) / len(complexities) if complexities else 0
+        )
     
     def _calculate_element_metrics(self, element: CodeElement, 
-                                  all_elements: Dict[str, CodeElement]) -> None:
+                                  project_graph: ProjectGraph) -> None:
         """Calculate metrics for individual code elements."""
         # Metrics would be calculated based on AST analysis
         # For now, set default values
+        defaults = {}
         if not element.complexity:
-            element.complexity = 1.0
+            defaults['complexity'] = 1.0
         if not element.lines_of_code:
-            element.lines_of_code = 1
+            defaults['lines_of_code'] = 1
+        if defaults:
+            project_graph.update_element(element.id, **defaults)
 
 
 class ProjectBuilder:
     """Main orchestrator for building hierarchical project representation."""
     
+    # Directories never descended into during file discovery
+    EXCLUDED_DIRS = frozenset({'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'dist', 'build'})
+    
+    # Below this many files, process startup outweighs parallel parsing
+    PROCESS_POOL_MIN_FILES = 50
+    
+    # Built graphs kept per tree fingerprint, so rebuilding an unchanged tree is free
+    GRAPH_CACHE_SIZE = 8
+    
     def __init__(self, cache_manager=None, max_workers: Optional[int] = None):
         self.cache_manager = cache_manager
         self.cache = cache_manager  # Keep backwards compatibility
@@ -252,12 +370,34 @@ class ProjectBuilder:
         self.hierarchy_analyzer = HierarchyAnalyzer()
         self.dependency_analyzer = DependencyAnalyzer()
         self.metrics_analyzer = MetricsAnalyzer()
+        # (project name, root, analysis id, per-file (rel, size, mtime)) -> ProjectGraph
+        self._graph_cache: OrderedDict = OrderedDict()
+        self._graph_cache_lock = threading.Lock()
     
     def build_project(self, project_name: str, root_path: Path, 
                      analysis_id: str) -> ProjectGraph:
-        """Build complete hierarchical project representation."""
+        """
+        Build complete hierarchical project representation.
+        
+        Graphs are cached per tree fingerprint, so callers building the same
+        unchanged tree share one ProjectGraph and must not mutate it.
+        """
         logger.info(f"Building project graph for {project_name}")
         
+        # 1. Discover and filter files
+        files = self._discover_files(root_path)
+        logger.info(f"Discovered {len(files)} files")
+        
+        # Reuse the graph built for this tree if no file was added, removed or modified
+        fingerprint = (project_name, str(root_path), analysis_id,
+                       tuple((record.rel, record.size, record.mtime_ns) for record in files))
+        with self._graph_cache_lock:
+            cached_graph = self._graph_cache.get(fingerprint)
+            if cached_graph is not None:
+                self._graph_cache.move_to_end(fingerprint)
+                logger.info(f"Reusing project graph for unchanged tree {root_path}")
+                return cached_graph
+        
         # Initialize project graph
         project_graph = ProjectGraph(
             project_id=analysis_id,
@@ -265,10 +405,6 @@ class ProjectBuilder:
             root_path=str(root_path)
         )
         
-        # 1. Discover and filter files
-        files = self._discover_files(root_path)
-        logger.info(f"Discovered {len(files)} files")
-        
         # 2. Retrieve existing file analyses from cache (avoid re-analysis)
         file_analyses = self._retrieve_cached_analyses(files, analysis_id, root_path)
         logger.info(f"Retrieved {len(file_analyses)} cached file analyses")
@@ -279,58 +415,99 @@ class ProjectBuilder:
         # 4. Extract code elements from file analyses
         code_elements = self._extract_code_elements(file_analyses, hierarchy_elements, root_path)
         
-        # 5. Combine all elements
-        all_elements = {**hierarchy_elements, **code_elements}
+        # 5. Combine all elements (in place: hierarchy_elements is not used separately)
+        hierarchy_elements.update(code_elements)
+        all_elements = hierarchy_elements
         
-        # 6. Analyze dependencies
-        self.dependency_analyzer.analyze_dependencies(all_elements, file_analyses)
+        # Index children by parent once for the analyzers below
+        children_by_parent = _index_children(all_elements)
         
-        # 7. Calculate metrics
-        self.metrics_analyzer.calculate_metrics(all_elements, file_analyses)
+        # 6. Populate project graph; the analyzers below edit it through its mutators
+        project_graph.add_elements(all_elements)
         
-        # 8. Populate project graph
-        for element in all_elements.values():
-            project_graph.add_element(element)
+        # 7. Analyze dependencies
+        self.dependency_analyzer.analyze_dependencies(project_graph, file_analyses)
+        
+        # 8. Calculate metrics
+        self.metrics_analyzer.calculate_metrics(project_graph, file_analyses, children_by_parent)
         
         logger.info(f"Project graph built with {len(all_elements)} elements")
+        with self._graph_cache_lock:
+            self._graph_cache[fingerprint] = project_graph
+            while len(self._graph_cache) > self.GRAPH_CACHE_SIZE:
+                self._graph_cache.popitem(last=False)
         return project_graph
     
-    def _discover_files(self, root_path: Path) -> List[Path]:
-        """Discover all analyzable files in the project."""
+    def _discover_files(self, root_path: Path) -> List[FileRecord]:
+        """
+        Discover all analyzable files in the project.
+        
+        Walks with os.scandir, pruning excluded directories before descending
+        and not following symlinked directories (as rglob does not). Relative
+        paths and languages are worked out during the walk, so later stages
+        need no further path arithmetic or language detection.
+        """
         files = []
-        excluded_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'dist', 'build'}
-        
-        for file_path in root_path.rglob('*'):
-            if file_path.is_file():
-                # Skip if in excluded directory
-                if any(part in excluded_dirs for part in file_path.parts):
+        pending = [(os.fspath(root_path), '')]
+        while pending:
+            dir_path, rel_dir = pending.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                rel = f"{rel_dir}{os.sep}{name}" if rel_dir else name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if name not in self.EXCLUDED_DIRS:
+                            subdirs.append((entry.path, rel))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    
+                    # Check if file is analyzable
+                    file_path = Path(entry.path)
+                    language = LanguageDetector.detect_language(file_path)
+                    if LanguageDetector.is_supported(language):
+                        stat = entry.stat()
+                        files.append(FileRecord(file_path, name, file_path.suffix, rel,
+                                                language, stat.st_size, stat.st_mtime_ns))
+                except OSError:
                     continue
-                
-                # Check if file is analyzable
-                if LanguageDetector.should_analyze_file(file_path):
-                    files.append(file_path)
+            
+            # Reversed so the first subdirectory is walked next
+            pending.extend(reversed(subdirs))
         
         return files
     
-    def _retrieve_cached_analyses(self, files: List[Path], analysis_id: str, root_path: Path) -> Dict[str, Dict]:
+    def _retrieve_cached_analyses(self, files: List[FileRecord], analysis_id: str,
+                                  root_path: Path) -> Dict[str, CachedAnalysis]:
         """Retrieve existing file analyses from cache instead of re-analyzing."""
         analyses = {}
         missing_files = []
         
         if not self.cache_manager:
             logger.warning("No cache manager available, falling back to re-analysis")
-            return self._analyze_files_parallel_fallback(files, analysis_id)
-        
-        # First, try to get cached analyses
-        for file_path in files:
-            cache_key = f"file:{analysis_id}:{file_path.name}"
-            
-            cached_analysis = self.cache_manager.get(cache_key)
-            if cached_analysis:
+            return self._analyze_files_parallel_fallback([record.path for record in files], analysis_id)
+        
+        # First, try to get cached analyses, keyed (as RepositoryAnalyzer writes
+        # them) by path relative to the repository root
+        key_prefix = f"file:{analysis_id}:"
+        keys = [key_prefix + record.rel for record in files]
+        # One batched lookup (a single MGET on Redis) instead of a round trip per file
+        cached = self.cache_manager.get_many(list(dict.fromkeys(keys)))
+        for record, cache_key in zip(files, keys):
+            file_path_str = str(record.path)
+            cached_analysis = cached.get(cache_key)
+            if cached_analysis and self._cached_for_file(cached_analysis, file_path_str, record.rel, root_path):
                 # Convert cached dict back to analysis format
-                analyses[str(file_path)] = self._convert_cached_to_analysis(cached_analysis, file_path)
+                analyses[file_path_str] = self._convert_cached_to_analysis(cached_analysis, record)
             else:
-                missing_files.append(file_path)
+                missing_files.append(record.path)
         
         # If we have missing files, try to analyze them
         if missing_files:
@@ -340,90 +517,66 @@ class ProjectBuilder:
         
         return analyses
     
-    def _convert_cached_to_analysis(self, cached_data: Dict, file_path: Path) -> Dict:
+    def _cached_for_file(self, cached_data: Dict, file_path: str, rel_path: str, root_path: Path) -> bool:
+        """Check a cached analysis was written for this file; entries without a path are misses."""
+        cached_path = cached_data.get('path')
+        if not cached_path:
+            return False
+        if cached_path == file_path:
+            return True
+        # Compare relative paths, in case the repository root was spelled differently
+        return os.path.relpath(cached_path, root_path) == rel_path
+    
+    def _convert_cached_to_analysis(self, cached_data: Dict, record: FileRecord) -> CachedAnalysis:
         """Convert cached analysis data to expected format."""
+        get = cached_data.get
         # Handle both old FileAnalysis format and new UniversalFileAnalysis format
-        if 'ast_nodes' in cached_data:
-            # Old FileAnalysis format
-            return {
-                'language': LanguageDetector.detect_language(file_path).value,
-                'classes': cached_data.get('classes', []),
-                'functions': cached_data.get('functions', []),
-                'variables': cached_data.get('variables', []),
-                'imports': cached_data.get('imports', []),
-                'complexity': cached_data.get('complexity', 1.0),
-                'lines_of_code': cached_data.get('lines_of_code', cached_data.get('lines', 0)),  # Handle both names
-                'ast_nodes': cached_data.get('ast_nodes', []),
-                'file_path': str(file_path)
-            }
+        old_format = 'ast_nodes' in cached_data
+        if old_format or 'language' not in cached_data:
+            language = record.language.value
         else:
-            # New UniversalFileAnalysis format or direct dict
-            return {
-                'language': cached_data.get('language', LanguageDetector.detect_language(file_path).value),
-                'classes': cached_data.get('classes', []),
-                'functions': cached_data.get('functions', []), 
-                'variables': cached_data.get('variables', []),
-                'imports': cached_data.get('imports', []),
-                'complexity': cached_data.get('complexity', 1.0),
-                'lines_of_code': cached_data.get('lines_of_code', cached_data.get('lines', 0)),  # Handle both names
-                'file_path': str(file_path)
-            }
+            language = cached_data['language']
+        
+        return CachedAnalysis(
+            file_path=str(record.path),
+            language=language,
+            classes=get('classes', []),
+            functions=get('functions', []),
+            variables=get('variables', []),
+            imports=get('imports', []),
+            complexity=get('complexity', 1.0),
+            lines_of_code=get('lines_of_code', get('lines', 0)),  # Handle both names
+            hash=get('hash', ''),
+            ast_nodes=get('ast_nodes', []) if old_format else [],
+        )
     
-    def _analyze_files_parallel_fallback(self, files: List[Path], analysis_id: str) -> Dict[str, Dict]:
+    def _analyze_files_parallel_fallback(self, files: List[Path], analysis_id: str) -> Dict[str, CachedAnalysis]:
         """Fallback method to analyze files when cache is unavailable."""
-        analyses = {}
-        
-        def analyze_single_file(file_path: Path) -> Optional[Dict]:
+        # Parsing holds the GIL, so large batches go to worker processes
+        if len(files) >= self.PROCESS_POOL_MIN_FILES:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Try universal analyzer first
-                analysis = AnalyzerFactory.analyze_file_auto(file_path, content)
-                if analysis:
-                    return {
-                        'language': analysis.language,
-                        'classes': analysis.classes,
-                        'functions': analysis.functions,
-                        'variables': analysis.variables,
-                        'imports': analysis.imports,
-                        'complexity': analysis.complexity,
-                        'lines_of_code': analysis.lines_of_code,
-                        'file_path': str(file_path)
-                    }
-                else:
-                    # Basic fallback for unsupported languages
-                    return {
-                        'language': LanguageDetector.detect_language(file_path).value,
-                        'classes': [],
-                        'functions': [],
-                        'variables': [],
-                        'imports': [],
-                        'complexity': 1.0,
-                        'lines_of_code': len(content.splitlines()),
-                        'file_path': str(file_path)
-                    }
-            except Exception as e:
-                logger.warning(f"Failed to analyze {file_path}: {e}")
-                return None
-        
-        # Use ThreadPoolExecutor for parallel analysis
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_file = {executor.submit(analyze_single_file, file_path): file_path 
-                            for file_path in files}
-            
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    analysis = future.result()
-                    if analysis:
-                        analyses[str(file_path)] = analysis
-                except Exception as e:
-                    logger.error(f"Error analyzing {file_path}: {e}")
+                return self._map_analyses(ProcessPoolExecutor, files, mp_context=_POOL_MP_CONTEXT)
+            except BrokenProcessPool as e:
+                logger.warning(f"Process pool unavailable, falling back to threads: {e}")
         
+        # Use ThreadPoolExecutor for small batches, where process startup dominates
+        return self._map_analyses(ThreadPoolExecutor, files)
+    
+    def _map_analyses(self, executor_class, files: List[Path],
+                      mp_context=None) -> Dict[str, CachedAnalysis]:
+        """Analyze files on an executor, dispatched in chunks via executor.map (mp_context: process pools only)."""
+        analyses = {}
+        # _analyze_project_file never raises, so map needs no per-future error handling
+        chunksize = max(1, len(files) // (self.max_workers * 4))
+        pool_options = {'mp_context': mp_context} if mp_context is not None else {}
+        with executor_class(max_workers=self.max_workers, **pool_options) as executor:
+            results = executor.map(_analyze_project_file, map(str, files), chunksize=chunksize)
+            for file_path, analysis in zip(files, results):
+                if analysis:
+                    analyses[str(file_path)] = analysis
         return analyses
     
-    def _extract_code_elements(self, file_analyses: Dict[str, Dict], 
+    def _extract_code_elements(self, file_analyses: Dict[str, CachedAnalysis], 
                               hierarchy_elements: Dict[str, CodeElement],
                               root_path: Path) -> Dict[str, CodeElement]:
         """Extract code elements (classes, functions, etc.) from file analyses."""
@@ -431,22 +584,29 @@ class ProjectBuilder:
         
         for file_path, analysis in file_analyses.items():
             file_id = f"file:{file_path}"
+            class_prefix = f"class:{file_path}:"
+            function_prefix = f"function:{file_path}:"
+            variable_prefix = f"variable:{file_path}:"
+            
+            # Exact locations would need AST analysis; every element of a file
+            # shares one placeholder (CodeLocation is frozen)
+            default_location = CodeLocation(
+                file_path=file_path,
+                line_start=1,
+                line_end=1,
+                col_start=0,
+                col_end=0
+            )
             
             # Create class elements
             for class_name in analysis.classes:
-                class_id = f"class:{file_path}:{class_name}"
+                class_id = class_prefix + class_name
                 class_element = CodeElement(
                     id=class_id,
                     name=class_name,
                     type=NodeType.CLASS,
                     language=analysis.language,
-                    location=CodeLocation(
-                        file_path=file_path,
-                        line_start=1,  # Would need AST analysis for exact location
-                        line_end=1,
-                        col_start=0,
-                        col_end=0
-                    ),
+                    location=default_location,
                     parent_id=file_id,
                     scope=Scope.PUBLIC,  # Default, would need analysis
                     properties={'file_analysis_id': analysis.hash}
@@ -455,7 +615,7 @@ class ProjectBuilder:
             
             # Create function elements
             for function_name in analysis.functions:
-                function_id = f"function:{file_path}:{function_name}"
+                function_id = function_prefix + function_name
                 
                 # Determine if it's a method (belongs to a class)
                 parent_id = file_id
@@ -466,7 +626,7 @@ class ProjectBuilder:
                     # Find the most likely parent class (simple heuristic)
                     if analysis.classes:
                         parent_class = analysis.classes[0]  # Simplified
-                        parent_id = f"class:{file_path}:{parent_class}"
+                        parent_id = class_prefix + parent_class
                         function_type = NodeType.METHOD
                 
                 function_element = CodeElement(
@@ -474,13 +634,7 @@ class ProjectBuilder:
                     name=function_name,
                     type=function_type,
                     language=analysis.language,
-                    location=CodeLocation(
-                        file_path=file_path,
-                        line_start=1,  # Would need AST analysis
-                        line_end=1,
-                        col_start=0,
-                        col_end=0
-                    ),
+                    location=default_location,
                     parent_id=parent_id,
                     scope=Scope.PUBLIC,
                     properties={'file_analysis_id': analysis.hash}
@@ -489,19 +643,13 @@ class ProjectBuilder:
             
             # Create variable elements
             for variable_name in analysis.variables:
-                variable_id = f"variable:{file_path}:{variable_name}"
+                variable_id = variable_prefix + variable_name
                 variable_element = CodeElement(
                     id=variable_id,
                     name=variable_name,
                     type=NodeType.VARIABLE,
                     language=analysis.language,
-                    location=CodeLocation(
-                        file_path=file_path,
-                        line_start=1,  # Would need AST analysis
-                        line_end=1,
-                        col_start=0,
-                        col_end=0
-                    ),
+                    location=default_location,
                     parent_id=file_id,
                     scope=Scope.LOCAL,  # Default
                     properties={'file_analysis_id': analysis.hash}
@@ -509,3 +657,79 @@ class ProjectBuilder:
                 elements[variable_id] = variable_element
         
         return elements
+
+
+def _file_analysis_for(file_element: CodeElement,
+                       file_analyses: Dict[str, UniversalFileAnalysis]) -> Optional[UniversalFileAnalysis]:
+    """Look up a file element's analysis; analyses are keyed by absolute path, locations are relative."""
+    return file_analyses.get(file_element.properties.get('absolute_path', file_element.location.file_path))
+
+
+def _index_children(elements: Dict[str, CodeElement]) -> Dict[str, List[CodeElement]]:
+    """Group elements by parent ID in one pass (elements without a parent are skipped)."""
+    children_by_parent = defaultdict(list)
+    for element in elements.values():
+        if element.parent_id:
+            children_by_parent[element.parent_id].append(element)
+    return children_by_parent
+
+
+def _analyze_project_file(file_path_str: str) -> Optional[CachedAnalysis]:
+    """Read and analyze one file; module level so process pool workers can run it."""
+    file_path = Path(file_path_str)
+    try:
+        # No analyzer would run: count lines without decoding the file
+        if not LanguageDetector.should_analyze_file(file_path):
+            return _basic_analysis(file_path, _count_lines(file_path))
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Try universal analyzer first
+        analysis = AnalyzerFactory.analyze_file_auto(file_path, content)
+        if analysis:
+            return CachedAnalysis(
+                file_path=str(file_path),
+                language=analysis.language,
+                classes=analysis.classes,
+                functions=analysis.functions,
+                variables=analysis.variables,
+                imports=analysis.imports,
+                complexity=analysis.complexity,
+                lines_of_code=analysis.lines,
+                hash=analysis.hash,
+            )
+        else:
+            # Basic fallback for unsupported languages
+            return _basic_analysis(file_path, len(content.splitlines()))
+    except Exception as e:
+        logger.warning(f"Failed to analyze {file_path}: {e}")
+        return None
+
+
+def _basic_analysis(file_path: Path, lines_of_code: int) -> CachedAnalysis:
+    """Placeholder analysis for files no analyzer handles."""
+    return CachedAnalysis(
+        file_path=str(file_path),
+        language=LanguageDetector.detect_language(file_path).value,
+        classes=[],
+        functions=[],
+        variables=[],
+        imports=[],
+        complexity=1.0,
+        lines_of_code=lines_of_code,
+    )
+
+
+def _count_lines(file_path: Path) -> int:
+    """Count lines in fixed-size binary chunks, in constant memory."""
+    lines = 0
+    last = b''
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(1 << 16):
+            lines += chunk.count(b'\n')
+            last = chunk
+    # A final line without a trailing newline still counts
+    if last and not last.endswith(b'\n'):
+        lines += 1
+    return lines
@@ -1,14 +1,37 @@
 """
 Project API - RESTful endpoints for hierarchical project navigation
 """
-from flask import Blueprint, request, jsonify
-from typing import Dict, List, Optional, Any
+from flask import Blueprint, request, jsonify, current_app
+from flask.json.provider import DefaultJSONProvider
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+import gzip
+from typing import Dict, List, Optional, Any, Iterable, Iterator
 import logging
+import threading
+import zlib
+from werkzeug.http import generate_etag
+
+# Import orjson safely (faster JSON encoding for large graph payloads)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Import brotli safely (denser than gzip for clients that accept it)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 from models.project_model import ProjectGraph, NodeType
 from views.navigation import ProjectNavigator, ViewLevel
-from views.visualizations import VisualizationAdapter, ChartType
+from views.visualizations import VisualizationAdapter
 from analyzers.project_builder import ProjectBuilder
+from cache_manager import CacheManager
+from key_cached_dict import KeyCachedDict
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -16,30 +39,208 @@ logger = logging.getLogger(__name__)
 # Create Blueprint
 project_bp = Blueprint('project', __name__, url_prefix='/api/v2')
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson; decoding is unchanged."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder still handles
+            return super().dumps(obj, **kwargs)
+
+
+if ORJSON_AVAILABLE:
+    @project_bp.record_once
+    def _use_orjson_provider(state):
+        """Back every jsonify call (including the routes below) with orjson."""
+        state.app.json = OrjsonProvider(state.app)
+
+
 # Import shared storage from main app (will be injected)
-_project_graphs: Dict[str, ProjectGraph] = {}
+_project_graphs: Dict[str, ProjectGraph] = KeyCachedDict()
 _project_navigators: Dict[str, ProjectNavigator] = {}
-
-def set_shared_storage(graphs: Dict[str, ProjectGraph], navigators: Dict[str, ProjectNavigator]):
+# Cache for rendered GET responses; disabled until the main app injects one
+_response_cache: Optional[CacheManager] = None
+
+# Project graph builds run here, off the request thread; analysis_id -> latest build
+_build_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='project-build')
+# analysis_id -> running or failed build; finished builds are dropped once stored
+_build_jobs: Dict[str, Future] = {}
+_build_jobs_lock = threading.Lock()
+# One builder for all builds, so its graph cache spans requests; graphs it
+# returns may be shared with earlier builds of the same unchanged tree
+_project_builder = ProjectBuilder()
+
+# Rendered GET responses are reused for this long unless the project changes
+RESPONSE_CACHE_TTL = 300
+
+# JSON bodies at least this large are compressed for clients that accept it
+COMPRESS_MIN_SIZE = 1024
+
+# Content-Encoding -> compressor, in order of preference
+_COMPRESSORS = {'gzip': lambda body: gzip.compress(body, compresslevel=6)}
+if BROTLI_AVAILABLE:
+    _COMPRESSORS = {'br': lambda body: brotli.compress(body, quality=4), **_COMPRESSORS}
+
+# Node type names, in enum order, for per-language type counts
+_NODE_TYPE_VALUES = tuple(node_type.value for node_type in NodeType)
+# Node type lookup for request filters, without NodeType(...) raising on bad input
+_NODE_TYPE_BY_VALUE = {node_type.value: node_type for node_type in NodeType}
+
+# Shared breadcrumb roots (tuples serialize as JSON arrays); filters extend a copy
+_BREADCRUMB_OVERVIEW = ('Project',)
+_BREADCRUMB_FILES = ('Project', 'Files')
+_BREADCRUMB_CLASSES = ('Project', 'Classes')
+_BREADCRUMB_FUNCTIONS = ('Project', 'Functions')
+
+# Chart set served by /charts/<chart_type> -> VisualizationAdapter getter
+_CHART_DISPATCH = {
+    'overview': 'get_project_overview_charts',
+    'files': 'get_file_level_charts',
+    'dependencies': 'get_dependency_charts',
+}
+
+def set_shared_storage(graphs: Dict[str, ProjectGraph], navigators: Dict[str, ProjectNavigator],
+                       cache_manager: Optional[CacheManager] = None):
     """Set shared storage references from main app."""
-    global _project_graphs, _project_navigators
+    global _project_graphs, _project_navigators, _response_cache
     _project_graphs = graphs
     _project_navigators = navigators
+    _response_cache = cache_manager
+
+
+def cached_json(ttl: int = RESPONSE_CACHE_TTL):
+    """
+    Serve a project GET route from the response cache, keyed by its full URL.
+    
+    Successful responses carry an ETag (a hash of the body, stored with it), so
+    clients revalidating with If-None-Match get an empty 304 instead.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(analysis_id: str, *args, **kwargs):
+            key = f"v2:{analysis_id}:{request.full_path}"
+            cached = _response_cache.get(key) if _response_cache is not None else None
+            if isinstance(cached, dict):
+                response = current_app.response_class(cached['body'], mimetype='application/json')
+                response.set_etag(cached['etag'])
+            elif not _get_navigator(analysis_id):
+                # Unknown projects (404) go straight to the view, uncached
+                return view(analysis_id, *args, **kwargs)
+            else:
+                response = current_app.make_response(view(analysis_id, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if response.is_streamed:
+                    # The body is not known up front: cache it once fully sent
+                    if _response_cache is not None:
+                        response.response = _cache_streamed_body(key, response.response, ttl)
+                    return response
+                response.add_etag()
+                if _response_cache is not None:
+                    _response_cache.set(key, {
+                        'body': response.get_data(as_text=True),
+                        'etag': response.get_etag()[0]
+                    }, expire=ttl)
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def _cache_streamed_body(key: str, chunks: Iterable, ttl: int) -> Iterator:
+    """Pass a streamed body through, caching it (with its ETag) if it completes."""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        yield chunk
+    body = b''.join(parts)
+    _response_cache.set(key, {'body': body.decode('utf-8'), 'etag': generate_etag(body)}, expire=ttl)
+
+
+def _gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a streamed body chunk by chunk, so it is never held whole."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@project_bp.after_request
+def _compress_response(response):
+    """Compress large JSON responses with the best encoding the client accepts."""
+    if (response.status_code != 200 or response.direct_passthrough
+            or response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if response.is_streamed:
+        # Its size is unknown up front; gzip is the encoding we can apply incrementally
+        if request.accept_encodings['gzip']:
+            response.response = _gzip_stream(response.iter_encoded())
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers.pop('Content-Length', None)
+        return response
+    
+    encoding = request.accept_encodings.best_match(_COMPRESSORS)
+    body = response.get_data()
+    if encoding is None or len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(_COMPRESSORS[encoding](body))
+    response.headers['Content-Encoding'] = encoding
+    # Each encoding is a different byte stream, so a strong ETag becomes weak
+    etag, is_weak = response.get_etag()
+    if etag and not is_weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def invalidate_cached_responses(analysis_id: str) -> None:
+    """Drop cached GET responses for a project whose graph or navigation changed."""
+    if _response_cache is not None:
+        _response_cache.clear_pattern(f"v2:{analysis_id}:*")
+
+
+def publish_project_graph(analysis_id: str, project_graph: ProjectGraph) -> None:
+    """
+    Store a project graph and its navigator for the API to serve.
+    
+    Cached responses for the project are dropped here and whenever its
+    navigator's context changes, so routes never invalidate by hand.
+    """
+    navigator = ProjectNavigator(project_graph,
+                                 on_context_change=lambda: invalidate_cached_responses(analysis_id))
+    with _build_jobs_lock:
+        _project_graphs[analysis_id] = project_graph
+        _project_navigators[analysis_id] = navigator
+        # The graph now answers status requests; drop a build job that made it
+        _build_jobs.pop(analysis_id, None)
+    invalidate_cached_responses(analysis_id)
 
 
 @project_bp.route('/project/<analysis_id>', methods=['GET'])
+@cached_json()
 def get_project_overview(analysis_id: str):
     """Get project overview."""
     navigator = _get_navigator(analysis_id)
     if not navigator:
-        return jsonify({'error': 'Project not found', 'available_analyses': list(_project_graphs.keys())}), 404
+        return jsonify({'error': 'Project not found', 'available_analyses': _available_analyses()}), 404
     
     try:
         view_data = navigator.get_project_overview()
         charts = _get_visualization_data(analysis_id, 'project')
         
         # Add breadcrumb for overview
-        breadcrumb = ['Project']
+        breadcrumb = _BREADCRUMB_OVERVIEW
         
         return jsonify({
             'status': 'success',
@@ -55,6 +256,7 @@ def get_project_overview(analysis_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/packages', methods=['GET'])
+@cached_json()
 def get_packages_view(analysis_id: str):
     """Get packages view."""
     navigator = _get_navigator(analysis_id)
@@ -78,6 +280,7 @@ def get_packages_view(analysis_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/files', methods=['GET'])
+@cached_json()
 def get_files_view(analysis_id: str):
     """Get files view."""
     navigator = _get_navigator(analysis_id)
@@ -91,9 +294,7 @@ def get_files_view(analysis_id: str):
         charts = _get_visualization_data(analysis_id, 'file', file_id)
         
         # Add breadcrumb
-        breadcrumb = ['Project', 'Files']
-        if file_id:
-            breadcrumb.append(file_id)
+        breadcrumb = _BREADCRUMB_FILES + (file_id,) if file_id else _BREADCRUMB_FILES
         
         return jsonify({
             'status': 'success',
@@ -109,6 +310,7 @@ def get_files_view(analysis_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/classes', methods=['GET'])
+@cached_json()
 def get_classes_view(analysis_id: str):
     """Get classes view."""
     navigator = _get_navigator(analysis_id)
@@ -119,9 +321,7 @@ def get_classes_view(analysis_id: str):
     
     try:
         view_data = navigator.get_classes_view()  # Use get_classes_view instead
-        breadcrumb = ['Project', 'Classes']
-        if class_filter:
-            breadcrumb.append(class_filter)
+        breadcrumb = _BREADCRUMB_CLASSES + (class_filter,) if class_filter else _BREADCRUMB_CLASSES
             
         return jsonify({
             'status': 'success',
@@ -137,6 +337,7 @@ def get_classes_view(analysis_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/functions', methods=['GET'])
+@cached_json()
 def get_functions_view(analysis_id: str):
     """Get functions view."""
     navigator = _get_navigator(analysis_id)
@@ -147,9 +348,7 @@ def get_functions_view(analysis_id: str):
     
     try:
         view_data = navigator.get_functions_view()  # Use get_functions_view instead
-        breadcrumb = ['Project', 'Functions']
-        if function_filter:
-            breadcrumb.append(function_filter)
+        breadcrumb = _BREADCRUMB_FUNCTIONS + (function_filter,) if function_filter else _BREADCRUMB_FUNCTIONS
             
         return jsonify({
             'status': 'success',
@@ -165,6 +364,7 @@ def get_functions_view(analysis_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/dependencies', methods=['GET'])
+@cached_json()
 def get_dependencies_view(analysis_id: str):
     """Get dependencies view."""
     navigator = _get_navigator(analysis_id)
@@ -206,10 +406,10 @@ def search_project(analysis_id: str):
     # Convert string types to NodeType enums
     node_types = None
     if element_types:
-        try:
-            node_types = [NodeType(t) for t in element_types]
-        except ValueError as e:
-            return jsonify({'error': f'Invalid element type: {e}'}), 400
+        node_types = [_NODE_TYPE_BY_VALUE.get(t) for t in element_types]
+        if None in node_types:
+            invalid = element_types[node_types.index(None)]
+            return jsonify({'error': f"Invalid element type: {invalid!r} is not a valid NodeType"}), 400
     
     try:
         view_data = navigator.search(query, node_types, languages)
@@ -251,25 +451,21 @@ def navigate_to_element(analysis_id: str, element_id: str):
 
 
 @project_bp.route('/project/<analysis_id>/charts/<chart_type>', methods=['GET'])
+@cached_json()
 def get_chart_data(analysis_id: str, chart_type: str):
     """Get specific chart data."""
     graph = _get_project_graph(analysis_id)
     if not graph:
         return jsonify({'error': 'Project not found'}), 404
     
+    # Get appropriate charts based on type
+    method_name = _CHART_DISPATCH.get(chart_type)
+    if method_name is None:
+        return jsonify({'error': f'Unknown chart type: {chart_type}'}), 400
+    
     try:
-        chart_type_enum = ChartType(chart_type)
-        adapter = VisualizationAdapter(graph)
-        
-        # Get appropriate charts based on type
-        if chart_type == 'overview':
-            charts = adapter.get_project_overview_charts()
-        elif chart_type == 'files':
-            charts = adapter.get_file_level_charts()
-        elif chart_type == 'dependencies':
-            charts = adapter.get_dependency_charts()
-        else:
-            return jsonify({'error': f'Unknown chart type: {chart_type}'}), 400
+        # The adapter only wraps the graph; its chart getters are memoized on it
+        charts = getattr(VisualizationAdapter(graph), method_name)()
         
         return jsonify({
             'status': 'success',
@@ -281,6 +477,7 @@ def get_chart_data(analysis_id: str, chart_type: str):
 
 
 @project_bp.route('/project/<analysis_id>/metrics', methods=['GET'])
+@cached_json()
 def get_project_metrics(analysis_id: str):
     """Get comprehensive project metrics."""
     graph = _get_project_graph(analysis_id)
@@ -288,68 +485,113 @@ def get_project_metrics(analysis_id: str):
         return jsonify({'error': 'Project not found'}), 404
     
     try:
-        metrics = graph.get_metrics()
-        
-        # Add additional computed metrics
-        additional_metrics = {
-            'file_tree': graph.get_file_tree(),
-            'complexity_stats': _calculate_complexity_stats(graph),
-            'dependency_stats': _calculate_dependency_stats(graph),
-            'language_breakdown': _calculate_language_breakdown(graph)
-        }
-        
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'basic_metrics': metrics,
-                'detailed_metrics': additional_metrics
-            }
-        })
+        # Every section is computed and serialized here, where errors can still
+        # become a 500; only the finished pieces are streamed, never joined
+        pieces = _serialize_project_metrics(graph, graph.get_metrics())
+        return current_app.response_class(iter(pieces), mimetype='application/json')
     except Exception as e:
         logger.error(f"Error getting project metrics: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+# Detailed metric sections, in the (sorted) key order jsonify would emit
+_DETAILED_METRICS = (
+    ('complexity_stats', lambda graph: _calculate_complexity_stats(graph)),
+    ('dependency_stats', lambda graph: _calculate_dependency_stats(graph)),
+    ('file_tree', lambda graph: graph.get_file_tree()),
+    ('language_breakdown', lambda graph: _calculate_language_breakdown(graph)),
+)
+
+
+def _serialize_project_metrics(graph: ProjectGraph, metrics: Dict[str, Any]) -> List[str]:
+    """Serialize the metrics response JSON one section at a time, as pieces to stream."""
+    json_provider = current_app.json
+    
+    def dumps(value: Any) -> str:
+        return json_provider.dumps(value, separators=(',', ':'))
+    
+    pieces = ['{"data":{"basic_metrics":' + dumps(metrics) + ',"detailed_metrics":{']
+    for index, (name, calculate) in enumerate(_DETAILED_METRICS):
+        pieces.append((',' if index else '') + dumps(name) + ':' + dumps(calculate(graph)))
+    pieces.append('}},"status":"success"}\n')
+    return pieces
+
+
 # Integration with existing analyzer
 @project_bp.route('/project/build/<analysis_id>', methods=['POST'])
 def build_project_graph(analysis_id: str):
-    """Build hierarchical project graph from existing analysis."""
+    """Start building a hierarchical project graph from an existing analysis (202 Accepted)."""
     try:
         # Get analysis details from request
         data = request.get_json()
         project_name = data.get('project_name', 'Unknown Project')
         root_path = data.get('root_path', '.')
         
-        # Build project graph
-        builder = ProjectBuilder()
-        project_graph = builder.build_project(
-            project_name=project_name,
-            root_path=Path(root_path),
-            analysis_id=analysis_id
-        )
-        
-        # Store for future access
-        _project_graphs[analysis_id] = project_graph
-        _project_navigators[analysis_id] = ProjectNavigator(project_graph)
+        with _build_jobs_lock:
+            # One build per analysis at a time; repeat requests just report it,
+            # and a request after a failed build retries it
+            job = _build_jobs.get(analysis_id)
+            if job is None or job.done():
+                _build_jobs[analysis_id] = _build_executor.submit(
+                    _do_build, analysis_id, project_name, Path(root_path)
+                )
         
-        return jsonify({
-            'status': 'success',
-            'data': {
-                'analysis_id': analysis_id,
-                'project_name': project_name,
-                'metrics': project_graph.get_metrics(),
-                'build_info': {
-                    'total_elements': len(project_graph.elements),
-                    'languages': list(project_graph.languages),
-                    'file_count': len(project_graph.files)
-                }
-            }
-        })
+        return jsonify({'status': 'building', 'analysis_id': analysis_id}), 202
     except Exception as e:
         logger.error(f"Error building project graph: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@project_bp.route('/project/build/<analysis_id>/status', methods=['GET'])
+def get_build_status(analysis_id: str):
+    """Report a background project build; returns the build summary once done."""
+    job = _build_jobs.get(analysis_id)
+    if job is not None:
+        if not job.done():
+            return jsonify({'status': 'building', 'analysis_id': analysis_id}), 202
+        
+        # Only failed builds stay registered; report the failure once
+        with _build_jobs_lock:
+            if _build_jobs.get(analysis_id) is job:
+                del _build_jobs[analysis_id]
+        error = job.exception()
+        if error is not None:
+            logger.error(f"Error building project graph: {error}")
+            return jsonify({'error': str(error)}), 500
+    
+    project_graph = _get_project_graph(analysis_id)
+    if project_graph is None:
+        return jsonify({'error': 'No build started for this analysis'}), 404
+    
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'analysis_id': analysis_id,
+            'project_name': project_graph.name,
+            'metrics': project_graph.get_metrics(),
+            'build_info': {
+                'total_elements': len(project_graph.elements),
+                'languages': list(project_graph.languages),
+                'file_count': len(project_graph.files)
+            }
+        }
+    })
+
+
+def _do_build(analysis_id: str, project_name: str, root_path: Path) -> ProjectGraph:
+    """Build a project graph off the request thread and publish it."""
+    project_graph = _project_builder.build_project(
+        project_name=project_name,
+        root_path=root_path,
+        analysis_id=analysis_id
+    )
+    
+    # Store for future access; the job entry was registered before the lock
+    # publish takes was released, so it is there to be dropped
+    publish_project_graph(analysis_id, project_graph)
+    return project_graph
+
+
 # Helper functions
 
 def _get_project_graph(analysis_id: str) -> Optional[ProjectGraph]:
@@ -357,6 +599,13 @@ def _get_project_graph(analysis_id: str) -> Optional[ProjectGraph]:
     return _project_graphs.get(analysis_id)
 
 
+def _available_analyses() -> tuple:
+    """IDs of the loaded project graphs, without copying the keys on every call."""
+    if isinstance(_project_graphs, KeyCachedDict):
+        return _project_graphs.keys_tuple
+    return tuple(_project_graphs)
+
+
 def _get_navigator(analysis_id: str) -> Optional[ProjectNavigator]:
     """Get project navigator by analysis ID."""
     return _project_navigators.get(analysis_id)
@@ -425,9 +674,20 @@ def _get_visualization_data(analysis_id: str, view_type: str,
 def _calculate_complexity_stats(graph: ProjectGraph) -> Dict[str, Any]:
     """Calculate complexity statistics."""
     complexities = []
+    # Bucket while collecting instead of rescanning the list once per bucket
+    low = medium = high = very_high = 0
     for element in graph.elements.values():
-        if element.complexity and element.complexity > 0:
-            complexities.append(element.complexity)
+        complexity = element.complexity
+        if complexity and complexity > 0:
+            complexities.append(complexity)
+            if complexity <= 5:
+                low += 1
+            elif complexity <= 10:
+                medium += 1
+            elif complexity <= 20:
+                high += 1
+            else:
+                very_high += 1
     
     if not complexities:
         return {'average': 0, 'max': 0, 'min': 0, 'distribution': {}}
@@ -438,18 +698,17 @@ def _calculate_complexity_stats(graph: ProjectGraph) -> Dict[str, Any]:
         'min': min(complexities),
         'total_elements': len(complexities),
         'distribution': {
-            'low': len([c for c in complexities if c <= 5]),
-            'medium': len([c for c in complexities if 5 < c <= 10]),
-            'high': len([c for c in complexities if 10 < c <= 20]),
-            'very_high': len([c for c in complexities if c > 20])
+            'low': low,
+            'medium': medium,
+            'high': high,
+            'very_high': very_high
         }
     }
 
 
 def _calculate_dependency_stats(graph: ProjectGraph) -> Dict[str, Any]:
     """Calculate dependency statistics."""
-    total_deps = sum(len(deps) for deps in graph.dependency_graph.values())
-    elements_with_deps = len([deps for deps in graph.dependency_graph.values() if deps])
+    total_deps, elements_with_deps = graph.dep_stats()
     
     return {
         'total_dependencies': total_deps,
@@ -461,21 +720,32 @@ def _calculate_dependency_stats(graph: ProjectGraph) -> Dict[str, Any]:
 
 def _calculate_language_breakdown(graph: ProjectGraph) -> Dict[str, Any]:
     """Calculate detailed language breakdown."""
-    breakdown = {}
-    
-    for language in graph.languages:
-        elements = [e for e in graph.elements.values() if e.language == language]
-        files = [e for e in elements if e.type == NodeType.FILE]
-        
-        breakdown[language] = {
-            'total_elements': len(elements),
-            'files': len(files),
-            'lines_of_code': sum(e.lines_of_code for e in files),
-            'average_complexity': sum(e.complexity or 0 for e in elements) / len(elements) if elements else 0,
-            'types': {
-                node_type.value: len([e for e in elements if e.type == node_type])
-                for node_type in NodeType
-            }
+    breakdown = {
+        language: {
+            'total_elements': 0,
+            'files': 0,
+            'lines_of_code': 0,
+            'average_complexity': 0,
+            'types': dict.fromkeys(_NODE_TYPE_VALUES, 0)
         }
+        for language in graph.languages
+    }
+    complexity_sums = dict.fromkeys(breakdown, 0)
+    
+    # One pass over the elements instead of one per language and node type
+    for element in graph.elements.values():
+        language_stats = breakdown.get(element.language)
+        if language_stats is None:
+            continue
+        language_stats['total_elements'] += 1
+        language_stats['types'][element.type.value] += 1
+        complexity_sums[element.language] += element.complexity or 0
+        if element.type == NodeType.FILE:
+            language_stats['files'] += 1
+            language_stats['lines_of_code'] += element.lines_of_code
+    
+    for language, language_stats in breakdown.items():
+        if language_stats['total_elements']:
+            language_stats['average_complexity'] = complexity_sums[language] / language_stats['total_elements']
     
     return breakdown
@@ -18,6 +18,7 @@ import time
 
 from ast_analyzer import RepositoryAnalyzer, SecurityError
 from cache_manager import CacheManager
+from key_cached_dict import KeyCachedDict
 
 # Import new modular architecture components
 from api.project_api import project_bp
@@ -50,7 +51,7 @@ CORS(app, origins=cors_origins)
 app.register_blueprint(project_bp)
 
 # Share storage with project API
-from api.project_api import set_shared_storage
+from api.project_api import set_shared_storage, publish_project_graph
 
 # Initialize components
 cache = CacheManager()
@@ -60,11 +61,11 @@ analyzer = RepositoryAnalyzer(cache)
 project_builder = ProjectBuilder(cache_manager=cache)
 
 # Global storage for project graphs (in production, use proper database)
-project_graphs: Dict[str, ProjectGraph] = {}
+project_graphs: Dict[str, ProjectGraph] = KeyCachedDict()  # Keys listed on every 404
 project_navigators: Dict[str, ProjectNavigator] = {}
 
 # Connect shared storage with project API
-set_shared_storage(project_graphs, project_navigators)
+set_shared_storage(project_graphs, project_navigators, cache)
 
 # Configuration
 UPLOAD_FOLDER = Path('uploads')
@@ -266,8 +267,7 @@ def analyze_repository():
             )
             
             # Store project graph and navigator
-            project_graphs[analysis_id] = project_graph
-            project_navigators[analysis_id] = ProjectNavigator(project_graph)
+            publish_project_graph(analysis_id, project_graph)
             
             logger.info(f"Project graph built with {len(project_graph.elements)} elements")
             
@@ -7,15 +7,24 @@ import ast
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from typing import Dict, List, Optional, Any, Sequence, Set, Tuple
+from dataclasses import dataclass
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter, or_
+import codecs
+import heapq
+import math
+import multiprocessing
+import re
 import json
 import hashlib
 import git
 import tempfile
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import threading
 import logging
 import time
@@ -39,25 +48,186 @@ except ImportError:
     RADON_AVAILABLE = False
     logging.warning("Radon not available, complexity analysis will be simplified")
 
+# Import xxhash safely (fast non-cryptographic node ids)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Pool workers start from a fresh interpreter (_init_worker builds their state):
+# forking the threaded server would copy its open Redis socket and any locks
+# other request threads hold, which can deadlock the child
+_POOL_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
 
-@dataclass
+# Compact one-byte type codes used by the complexity kernels (unlisted types encode as 0)
+_CC_NODE_CODES = {
+    ast.If: 1, ast.For: 2, ast.While: 3, ast.Try: 4, ast.BoolOp: 5,
+    ast.Compare: 6, ast.ExceptHandler: 7, ast.With: 8, ast.Assert: 9,
+    ast.FunctionDef: 10, ast.AsyncFunctionDef: 10, ast.ClassDef: 11,
+}
+# Per-code weights for function complexity; an except handler counts once for
+# itself and once for its enclosing try block
+_NODE_CC_WEIGHTS = {1: 1, 2: 1, 3: 1, 5: 1, 6: 1, 7: 2}
+# Decision and definition codes tallied by the simple file-level fallback
+_SIMPLE_CC_WEIGHTS = {code: 1 for code in (1, 2, 3, 4, 7, 8, 9, 10, 11)}
+
+
+# Bounded LRU of file complexity scores keyed by content digest; complexity is
+# a pure function of the source, so repeat runs over unchanged files skip radon
+_CC_CACHE_SIZE = 8192
+_cc_cache: 'OrderedDict[str, float]' = OrderedDict()
+_cc_cache_lock = threading.Lock()
+
+# Fields copied into ASTNode.properties, and the attributes tried (in order) for its name
+_ESSENTIAL_FIELDS = frozenset({'name', 'id', 'arg', 'attr', 'value'})
+_NAME_ATTRS = ('name', 'id', 'arg')
+_FUNCTION_CODE = _CC_NODE_CODES[ast.FunctionDef]
+
+# Per AST node type: (interned class name, name attribute or None, essential
+# fields in declaration order, is a function definition); filled on first sight
+_NODE_SPECS: Dict[type, Tuple[str, Optional[str], Tuple[str, ...], bool]] = {}
+
+
+def _node_spec(node_type: type) -> Tuple[str, Optional[str], Tuple[str, ...], bool]:
+    """Type-level facts _process_node needs, computed once per AST node type."""
+    spec = _NODE_SPECS.get(node_type)
+    if spec is None:
+        fields = node_type._fields
+        spec = _NODE_SPECS[node_type] = (
+            sys.intern(node_type.__name__),
+            next((attr for attr in _NAME_ATTRS if attr in fields), None),
+            tuple(field for field in fields if field in _ESSENTIAL_FIELDS),
+            _CC_NODE_CODES.get(node_type) == _FUNCTION_CODE,
+        )
+    return spec
+
+
+def _node_id_digest(key: bytes) -> str:
+    """Short (48-bit) hex id for a node key; xxh3 when available, else blake2b."""
+    if XXHASH_AVAILABLE:
+        return format(xxhash.xxh3_64_intdigest(key) & 0xFFFFFFFFFFFF, '012x')
+    return hashlib.blake2b(key, digest_size=6).hexdigest()
+
+
+def _path_name(path: str) -> str:
+    """Path(path).name without building a Path (metrics loops run once per file)."""
+    return os.path.basename(path)
+
+
+def _path_stem(path: str) -> str:
+    """Path(path).stem without building a Path."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+@lru_cache(maxsize=8192)
+def _import_root(imp: str) -> str:
+    """First component of a dotted import; most imports (os, sys, ...) repeat across files."""
+    return imp.split('.', 1)[0]
+
+
+# Decision-point keywords for the parse-free complexity estimate
+_CC_TOKEN_RE = re.compile(rb'\b(?:if|elif|while|for|except|and|or|with|assert|try|case)\b')
+
+
+def _encode_node_types(root: ast.AST) -> bytes:
+    """Encode every node under root (inclusive) as a one-byte type code."""
+    codes = _CC_NODE_CODES
+    return bytes(codes.get(type(node), 0) for node in ast.walk(root))
+
+
+def _cc_kernel(codes: bytes, weights: Dict[int, int]) -> int:
+    """Weighted count of type codes; bytes.count keeps the tally loop in C."""
+    return sum(codes.count(code) * weight for code, weight in weights.items())
+
+
+class _EmptyProperties(dict):
+    """Read-only empty dict shared by nodes without properties; pickles to the singleton."""
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared empty node properties are read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    update = setdefault = pop = popitem = clear = _read_only
+    
+    def __reduce__(self):
+        return (_empty_properties, ())
+
+
+def _empty_properties() -> '_EmptyProperties':
+    return _EMPTY_PROPERTIES
+
+
+_EMPTY_PROPERTIES = _EmptyProperties()
+
+# Shared children of leaf nodes; the empty tuple also unpickles to a singleton
+_EMPTY_CHILDREN: Tuple[str, ...] = ()
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter over string keys; k probes by double hashing one blake2b digest."""
+    __slots__ = ('num_bits', 'num_hashes', 'bits')
+    
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytes] = None):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = (self.num_bits + 7) // 8
+        # Bits persisted under other parameters are unusable; start empty
+        self.bits = bytearray(bits) if bits is not None and len(bits) == size else bytearray(size)
+    
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+    
+    def add(self, key: str):
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+    
+    def merge(self, bits: bytes):
+        """OR in bits persisted by another process with the same parameters."""
+        if len(bits) == len(self.bits):
+            self.bits = bytearray(map(or_, self.bits, bits))
+
+
+@dataclass(slots=True, weakref_slot=True)
 class ASTNode:
-    """Represents an AST node with metadata."""
+    """Represents an AST node with metadata (slotted: one instance per AST node)."""
     id: str
     type: str
     name: Optional[str]
     file: str
     line: int
     col: int
-    children: List[str]
+    children: Sequence[str]
     properties: Dict[str, Any]
     complexity: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        # Shallow copies instead of asdict's recursive deepcopy
+        return {
+            'id': self.id,
+            'type': self.type,
+            'name': self.name,
+            'file': self.file,
+            'line': self.line,
+            'col': self.col,
+            'children': list(self.children),
+            'properties': dict(self.properties),
+            'complexity': self.complexity
+        }
 
 
 @dataclass
@@ -88,6 +258,11 @@ class FileAnalysis:
             'size_bytes': self.size_bytes,
             'encoding': self.encoding
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FileAnalysis':
+        """Rebuild an analysis from the dictionary produced by to_dict."""
+        return cls(**{**data, 'nodes': [ASTNode(**node) for node in data['nodes']]})
 
 
 class SecurityError(Exception):
@@ -95,6 +270,128 @@ class SecurityError(Exception):
     pass
 
 
+# Node types cached for search and display by _extract_essential_nodes
+_ESSENTIAL_NODE_TYPES = frozenset({'FunctionDef', 'ClassDef', 'AsyncFunctionDef', 'Import', 'ImportFrom'})
+
+
+# Per-thread reusable legacy visitor (see _LegacyPythonVisitor.for_file)
+_visitor_local = threading.local()
+
+
+class _LegacyPythonVisitor(ast.NodeVisitor):
+    """Single-pass visitor collecting nodes, symbols and function complexity."""
+    
+    # type(node) -> unbound visit method, resolved once per AST class instead
+    # of NodeVisitor's per-node 'visit_' + class name string build and getattr
+    _dispatch: Dict[type, Any] = {}
+    
+    def __init__(self, analyzer: 'RepositoryAnalyzer', file_path: str):
+        self.nodes: List[ASTNode] = []
+        self.imports: List[str] = []
+        self.classes: List[str] = []
+        self.functions: List[str] = []
+        self.function_complexities: List[int] = []
+        self._complexity_stack: List[int] = []  # Open function scopes, innermost last
+        self.reset(analyzer, file_path)
+    
+    @classmethod
+    def for_file(cls, analyzer: 'RepositoryAnalyzer', file_path: str) -> '_LegacyPythonVisitor':
+        """Reuse this thread's visitor (reset for file_path) instead of allocating one per file."""
+        visitor = getattr(_visitor_local, 'visitor', None)
+        if visitor is None:
+            visitor = _visitor_local.visitor = cls(analyzer, file_path)
+        else:
+            visitor.reset(analyzer, file_path)
+        return visitor
+    
+    def reset(self, analyzer: 'RepositoryAnalyzer', file_path: str):
+        """Prepare for a new file; results from the previous file must be copied out first."""
+        self.analyzer = analyzer
+        self.file_path = file_path
+        self._process_node = analyzer._process_node
+        self.nodes.clear()
+        self.imports.clear()
+        self.classes.clear()
+        self.functions.clear()
+        self.function_complexities.clear()
+        self._complexity_stack.clear()
+        self._current = None
+    
+    def visit(self, node: ast.AST):
+        self._current = self._process_node(node, self.file_path, False)
+        if self._current:
+            self.nodes.append(self._current)
+        
+        node_type = type(node)
+        method = self._dispatch.get(node_type)
+        if method is None:
+            method = self._dispatch[node_type] = getattr(
+                type(self), 'visit_' + node_type.__name__, type(self).generic_visit)
+        method(self, node)
+    
+    def generic_visit(self, node: ast.AST):
+        # Same traversal order as ast.NodeVisitor.generic_visit, minus iter_fields
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+    
+    def average_complexity(self) -> float:
+        """Average cyclomatic complexity over all functions (1.0 if none)."""
+        if not self.function_complexities:
+            return 1.0
+        return sum(self.function_complexities) / len(self.function_complexities)
+    
+    def _add_complexity(self, amount: int) -> None:
+        if self._complexity_stack:
+            self._complexity_stack[-1] += amount
+    
+    def visit_Import(self, node: ast.Import):
+        self.imports.extend(alias.name for alias in node.names)
+        self.generic_visit(node)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module:
+            self.imports.append(node.module)
+        self.generic_visit(node)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes.append(node.name)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node):
+        node_data = self._current
+        self.functions.append(node.name)
+        
+        self._complexity_stack.append(1)  # Base complexity
+        self.generic_visit(node)
+        complexity = self._complexity_stack.pop()
+        
+        # Nested functions also count towards their enclosing function
+        self._add_complexity(complexity - 1)
+        self.function_complexities.append(complexity)
+        if node_data:
+            node_data.complexity = complexity
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def _visit_decision(self, node: ast.AST):
+        self._add_complexity(1)
+        self.generic_visit(node)
+    
+    visit_If = visit_While = visit_For = visit_ExceptHandler = _visit_decision
+    visit_BoolOp = visit_Compare = _visit_decision
+    
+    def visit_Try(self, node: ast.Try):
+        self._add_complexity(len(node.handlers))
+        self.generic_visit(node)
+
+
 class RepositoryAnalyzer:
     """Modern AST analyzer for Python repositories with security and performance optimizations."""
     
@@ -103,15 +400,47 @@ class RepositoryAnalyzer:
     MAX_TOTAL_SIZE = 500 * 1024 * 1024  # 500MB total
     MAX_FILES = 10000  # Maximum files to process
     
+    # Below this many files, process startup outweighs parallel parsing
+    PROCESS_POOL_MIN_FILES = 50
+    
+    # Queued per-file cache writes are flushed after this many analyzed files
+    CACHE_FLUSH_INTERVAL = 100
+    
+    # Per-file analyses keyed by content fingerprint outlive a single run
+    FINGERPRINT_TTL = 7 * 24 * 3600
+    
+    # Bloom filter of stored fingerprint keys, persisted under FINGERPRINT_FILTER_KEY;
+    # 1M keys at 1% false positives is about 1.2 MB. Each save writes a new token
+    # under FINGERPRINT_FILTER_VERSION_KEY; on a filter miss, other writers' bits
+    # are merged in when it changed (checked at most every REFRESH_INTERVAL seconds)
+    FINGERPRINT_FILTER_KEY = 'bloom:fa'
+    FINGERPRINT_FILTER_VERSION_KEY = 'bloom:fa:version'
+    FINGERPRINT_FILTER_REFRESH_INTERVAL = 5.0
+    FINGERPRINT_FILTER_CAPACITY = 1_000_000
+    FINGERPRINT_FILTER_ERROR_RATE = 0.01
+    
+    # Nodes kept per analysis for search (the most complex ones)
+    MAX_ESSENTIAL_NODES = 1000
+    
+    # Visualization payloads are memoized per analysis: in process for
+    # VISUALIZATION_TTL seconds (at most VISUALIZATION_CACHE_SIZE of them),
+    # and in the shared cache for VISUALIZATION_CACHE_EXPIRE seconds
+    VISUALIZATION_TTL = 300
+    VISUALIZATION_CACHE_SIZE = 32
+    VISUALIZATION_CACHE_EXPIRE = 3600
+    
+    # History fetched by analyze_incremental, usually enough to reach the previous run
+    INCREMENTAL_CLONE_DEPTH = 50
+    
     # Excluded directories for security and performance
-    EXCLUDED_DIRS = {
+    EXCLUDED_DIRS = frozenset({
         '.git', '__pycache__', 'venv', 'env', '.env', 'node_modules',
         '.venv', 'site-packages', 'dist', 'build', '.pytest_cache',
         '.mypy_cache', '.tox', 'htmlcov', '.coverage'
-    }
+    })
     
     # Allowed file extensions (now supports multiple languages)
-    ALLOWED_EXTENSIONS = {
+    ALLOWED_EXTENSIONS = frozenset({
         # Python
         '.py', '.pyw',
         # JavaScript/TypeScript
@@ -122,28 +451,41 @@ class RepositoryAnalyzer:
         '.java',
         # Web languages
         '.css', '.scss', '.sass', '.less', '.html', '.htm', '.xhtml'
-    }
+    })
     
-    def __init__(self, cache_manager=None, max_workers: Optional[int] = None):
+    def __init__(self, cache_manager=None, max_workers: Optional[int] = None,
+                 use_radon: bool = False):
         """
         Initialize repository analyzer.
         
         Args:
             cache_manager: Cache manager instance
             max_workers: Maximum worker threads (defaults to CPU count / 2)
+            use_radon: Use radon for file complexity in legacy Python analysis
+                instead of the counts collected during the AST pass
         """
         self.cache = cache_manager
+        self.use_radon = use_radon and RADON_AVAILABLE
         # MEMORY OPTIMIZATION: Use WeakValueDictionary to allow garbage collection
         import weakref
         self.node_registry: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
         self.file_registry: Dict[str, FileAnalysis] = {}
         self._lock = threading.Lock()
         self.max_workers = max_workers or max(1, os.cpu_count() // 2)
-        
-        # MEMORY OPTIMIZATION: Interning frequently used strings
-        self._string_cache = {}
-        self._node_type_cache = {}
-        
+        # Per-file cache writes queued during _parallel_analyze: expire -> {key: value}
+        self._write_batch: Optional[Dict[int, Dict[str, Any]]] = None
+        # Fingerprint key per analyzed file path, recorded during analyze_local
+        self._fingerprint_index: Optional[Dict[str, str]] = None
+        # Repository root per running analyze_local, for per-file cache keys
+        self._analysis_roots: Dict[str, Path] = {}
+        # Known fingerprint keys, so cache misses are answered without a round trip
+        self._fingerprint_filter_version: Any = None
+        self._fingerprint_filter_checked = time.monotonic()
+        self._fingerprint_filter = self._load_fingerprint_filter() if cache_manager else None
+        self._fingerprint_filter_dirty = False
+        # analysis_id -> (time computed, visualization payload)
+        self._viz_cache: OrderedDict = OrderedDict()
+    
     def _validate_path(self, path: Path) -> None:
         """
         Validate path for security issues.
@@ -254,23 +596,7 @@ class RepositoryAnalyzer:
                     single_branch=True  # Only clone the default branch
                 )
                 
-                # Mark this as a temporary clone for source caching
-                self._temp_repo_path = str(repo_path)
-                self._repo_url = repo_url
-                
-                try:
-                    result = self.analyze_local(str(repo_path), analysis_id)
-                    
-                    # Cache source files before the temporary directory is cleaned up
-                    self._cache_source_files(repo_path, analysis_id)
-                    
-                    return result
-                finally:
-                    # Clean up attributes
-                    if hasattr(self, '_temp_repo_path'):
-                        delattr(self, '_temp_repo_path')
-                    if hasattr(self, '_repo_url'):
-                        delattr(self, '_repo_url')
+                return self._analyze_clone(repo, repo_path, repo_url, analysis_id)
                 
             except git.exc.GitError as e:
                 logger.error(f"Git clone failed: {e}")
@@ -279,13 +605,152 @@ class RepositoryAnalyzer:
                 logger.error(f"Repository analysis failed: {e}")
                 raise
     
-    def analyze_local(self, repo_path: str, analysis_id: str) -> Dict:
+    def analyze_incremental(self, repo_url: str, prev_sha: Optional[str], analysis_id: str) -> Dict:
+        """
+        Re-analyze a repository, parsing only files changed since prev_sha.
+        
+        Files untouched between prev_sha and HEAD are served from the
+        fingerprint cache recorded by the analysis of prev_sha, without being
+        read or parsed. Falls back to a full analysis when prev_sha was never
+        analyzed or cannot be fetched.
+        
+        Args:
+            repo_url: Git repository URL
+            prev_sha: Previously analyzed commit (defaults to the last one recorded)
+            analysis_id: Unique analysis identifier
+            
+        Returns:
+            Analysis results dictionary
+        """
+        self._validate_url(repo_url)
+        
+        repo_key = self._repo_state_key(repo_url)
+        if prev_sha is None and self.cache:
+            prev_sha = self.cache.get(f"{repo_key}:head")
+        if prev_sha is not None and not re.fullmatch(r'[0-9a-fA-F]{4,40}', str(prev_sha)):
+            raise ValueError(f"Invalid commit SHA: {prev_sha}")
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                repo_path = Path(tmpdir) / 'repo'
+                logger.info(f"Cloning repository for incremental analysis: {repo_url}")
+                
+                # Recent history usually reaches prev_sha; older commits are fetched directly
+                repo = git.Repo.clone_from(
+                    repo_url,
+                    repo_path,
+                    depth=self.INCREMENTAL_CLONE_DEPTH,
+                    single_branch=True
+                )
+                
+                reuse = None
+                if prev_sha and self._ensure_commit(repo, prev_sha):
+                    reuse = self._unchanged_fingerprints(repo, repo_path, repo_key, prev_sha)
+                if reuse is None:
+                    logger.info(f"No reusable analysis for {repo_url}@{prev_sha}, analyzing fully")
+                
+                return self._analyze_clone(repo, repo_path, repo_url, analysis_id, reuse)
+                
+            except git.exc.GitError as e:
+                logger.error(f"Git clone failed: {e}")
+                raise ValueError(f"Failed to clone repository: {e}")
+            except Exception as e:
+                logger.error(f"Incremental analysis failed: {e}")
+                raise
+    
+    def _analyze_clone(self, repo: 'git.Repo', repo_path: Path, repo_url: str, analysis_id: str,
+                       reuse: Optional[Dict[str, str]] = None) -> Dict:
+        """Analyze a temporary clone and record its HEAD for later incremental runs."""
+        # Mark this as a temporary clone for source caching
+        self._temp_repo_path = str(repo_path)
+        self._repo_url = repo_url
+        
+        try:
+            result = self.analyze_local(str(repo_path), analysis_id, reuse)
+            
+            # Cache source files before the temporary directory is cleaned up
+            self._cache_source_files(repo_path, analysis_id)
+            
+            if self.cache:
+                repo_key = self._repo_state_key(repo_url)
+                head_sha = repo.head.commit.hexsha
+                self.cache.set_many({
+                    f"{repo_key}:{head_sha}": analysis_id,
+                    f"{repo_key}:head": head_sha
+                }, expire=self.FINGERPRINT_TTL)
+            
+            return result
+        finally:
+            # Clean up attributes
+            if hasattr(self, '_temp_repo_path'):
+                delattr(self, '_temp_repo_path')
+            if hasattr(self, '_repo_url'):
+                delattr(self, '_repo_url')
+    
+    def _repo_state_key(self, repo_url: str) -> str:
+        """Cache key prefix for per-commit analysis records of a repository."""
+        return f"repo:{hashlib.blake2b(repo_url.encode(), digest_size=16).hexdigest()}"
+    
+    def _ensure_commit(self, repo: 'git.Repo', sha: str) -> bool:
+        """Make sure sha is present in a shallow clone, fetching it if needed."""
+        try:
+            repo.git.rev_parse('--verify', '--quiet', f"{sha}^{{commit}}")
+            return True
+        except git.exc.GitCommandError:
+            pass
+        
+        try:
+            repo.git.fetch('--depth=1', 'origin', sha)
+            return True
+        except git.exc.GitCommandError as e:
+            logger.info(f"Commit {sha} is not reachable: {e}")
+            return False
+    
+    def _unchanged_fingerprints(self, repo: 'git.Repo', repo_path: Path, repo_key: str,
+                                prev_sha: str) -> Optional[Dict[str, str]]:
+        """
+        Fingerprint keys of files not changed between prev_sha and HEAD.
+        
+        Args:
+            repo: Clone containing both commits
+            repo_path: Working tree of the clone
+            repo_key: Repository state key prefix
+            prev_sha: Previously analyzed commit
+            
+        Returns:
+            Mapping of absolute file path to fingerprint key, or None if
+            prev_sha has no recorded analysis
+        """
+        if not self.cache:
+            return None
+        
+        full_sha = repo.commit(prev_sha).hexsha
+        prev_analysis_id = self.cache.get(f"{repo_key}:{full_sha}")
+        fingerprints = self.cache.get(f"fingerprints:{prev_analysis_id}") if prev_analysis_id else None
+        if not isinstance(fingerprints, dict):
+            return None
+        
+        changed = {
+            name for name in repo.git.diff('--name-only', '-z', full_sha, 'HEAD').split('\0')
+            if os.path.splitext(name)[1] in self.ALLOWED_EXTENSIONS
+        }
+        logger.info(f"{len(changed)} source files changed since {full_sha[:12]}")
+        
+        return {
+            str(repo_path / relative_path): key
+            for relative_path, key in fingerprints.items()
+            if relative_path not in changed
+        }
+    
+    def analyze_local(self, repo_path: str, analysis_id: str,
+                      reuse: Optional[Dict[str, str]] = None) -> Dict:
         """
         Analyze local repository with security and size validation.
         
         Args:
             repo_path: Path to local repository
             analysis_id: Unique analysis identifier
+            reuse: Fingerprint keys of files known to be unchanged, by file path
             
         Returns:
             Analysis results dictionary
@@ -304,8 +769,18 @@ class RepositoryAnalyzer:
         
         logger.info(f"Found {len(python_files)} Python files to analyze")
         
-        # Analyze files in parallel
-        results = self._parallel_analyze(python_files, analysis_id)
+        # Analyze files in parallel, recording each file's fingerprint
+        self._fingerprint_index = {}
+        self._analysis_roots[analysis_id] = repo_path
+        try:
+            results = self._parallel_analyze(python_files, analysis_id, reuse)
+            fingerprints = {
+                str(Path(path).relative_to(repo_path)): key
+                for path, key in self._fingerprint_index.items()
+            }
+        finally:
+            self._fingerprint_index = None
+            self._analysis_roots.pop(analysis_id, None)
         
         # Generate summary and metrics
         summary = self._generate_summary(results)
@@ -325,12 +800,18 @@ class RepositoryAnalyzer:
             }
             self.cache.set(f"analysis:{analysis_id}", summary_data, expire=7200)
             
+            # Lets a later incremental run skip files that did not change
+            self.cache.set(f"fingerprints:{analysis_id}", fingerprints, expire=self.FINGERPRINT_TTL)
+            
             # MEMORY OPTIMIZATION: Cache files in smaller chunks to reduce memory pressure
             chunk_size = 50  # Files per chunk
-            for i in range(0, len(results), chunk_size):
-                chunk = results[i:i + chunk_size]
-                chunk_data = [self._file_to_compact_dict(f) for f in chunk]
-                self.cache.set(f"files:{analysis_id}:{i//chunk_size}", chunk_data, expire=7200)
+            chunks = {
+                f"files:{analysis_id}:{i//chunk_size}": self._files_to_columns(results[i:i + chunk_size])
+                for i in range(0, len(results), chunk_size)
+            }
+            # The count lets readers fetch all chunks in a single get_many
+            chunks[f"files:{analysis_id}:_count"] = len(chunks)
+            self.cache.set_many(chunks, expire=7200)
             
             # MEMORY OPTIMIZATION: Only cache essential node data, not full objects
             essential_nodes = self._extract_essential_nodes()
@@ -364,41 +845,28 @@ class RepositoryAnalyzer:
         total_size = 0
         
         try:
-            for root, dirs, files in os.walk(repo_path):
-                # Remove excluded directories
-                dirs[:] = [d for d in dirs if d not in self.EXCLUDED_DIRS]
-                
-                for file in files:
-                    file_path = Path(root) / file
-                    
-                    # Check file extension
-                    if file_path.suffix not in self.ALLOWED_EXTENSIONS:
+            for entry in self._scan_candidate_files(repo_path):
+                try:
+                    # Check file size (DirEntry caches the stat result)
+                    file_size = entry.stat().st_size
+                    if file_size > self.MAX_FILE_SIZE:
+                        logger.warning(f"Skipping large file: {entry.path} ({file_size} bytes)")
                         continue
                     
-                    try:
-                        # Check file size
-                        file_size = file_path.stat().st_size
-                        if file_size > self.MAX_FILE_SIZE:
-                            logger.warning(f"Skipping large file: {file_path} ({file_size} bytes)")
-                            continue
-                        
-                        total_size += file_size
-                        if total_size > self.MAX_TOTAL_SIZE:
-                            logger.warning(f"Total size limit reached, stopping file discovery")
-                            break
-                        
-                        python_files.append(file_path)
+                    total_size += file_size
+                    if total_size > self.MAX_TOTAL_SIZE:
+                        logger.warning(f"Total size limit reached, stopping file discovery")
+                        break
+                    
+                    python_files.append(Path(entry.path))
+                    
+                    if len(python_files) >= self.MAX_FILES:
+                        logger.warning(f"File count limit reached: {self.MAX_FILES}")
+                        break
                         
-                        if len(python_files) >= self.MAX_FILES:
-                            logger.warning(f"File count limit reached: {self.MAX_FILES}")
-                            break
-                            
-                    except OSError as e:
-                        logger.warning(f"Cannot access file {file_path}: {e}")
-                        continue
-                
-                if len(python_files) >= self.MAX_FILES or total_size > self.MAX_TOTAL_SIZE:
-                    break
+                except OSError as e:
+                    logger.warning(f"Cannot access file {entry.path}: {e}")
+                    continue
                     
         except Exception as e:
             logger.error(f"Error finding Python files: {e}")
@@ -406,10 +874,87 @@ class RepositoryAnalyzer:
         
         return python_files
     
-    def _parallel_analyze(self, files: List[Path], analysis_id: str) -> List[FileAnalysis]:
+    def _scan_candidate_files(self, repo_path: Path):
+        """
+        Yield DirEntry objects for files with an allowed extension.
+        
+        Walks top-down in the same order as os.walk, pruning excluded
+        directories and not descending into symlinked directories.
+        """
+        pending = [os.fspath(repo_path)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if entry.name not in self.EXCLUDED_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    pass
+                if os.path.splitext(entry.name)[1] in self.ALLOWED_EXTENSIONS:
+                    yield entry
+            
+            # Reversed so the first subdirectory is walked next
+            pending.extend(reversed(subdirs))
+    
+    def _parallel_analyze(self, files: List[Path], analysis_id: str,
+                          reuse: Optional[Dict[str, str]] = None) -> List[FileAnalysis]:
         """
         Analyze multiple files in parallel with error handling.
         
+        Args:
+            files: List of file paths to analyze
+            analysis_id: Analysis identifier
+            reuse: Fingerprint keys of files known to be unchanged, by file path
+            
+        Returns:
+            List of file analysis results
+        """
+        # Queue per-file cache writes and send them in batches
+        self._write_batch = {}
+        try:
+            reused = self._reuse_analyses(files, analysis_id, reuse) if reuse else []
+            if reused:
+                done = {analysis.path for analysis in reused}
+                files = [f for f in files if str(f) not in done]
+                logger.info(f"Reused {len(reused)} unchanged files, analyzing {len(files)}")
+            
+            if len(files) >= self.PROCESS_POOL_MIN_FILES:
+                try:
+                    return reused + self._process_pool_analyze(files, analysis_id)
+                except BrokenProcessPool as e:
+                    logger.warning(f"Process pool unavailable, falling back to threads: {e}")
+            
+            return reused + self._thread_pool_analyze(files, analysis_id)
+        finally:
+            self._flush_cache_writes()
+            self._write_batch = None
+            self._persist_fingerprint_filter()
+    
+    def _reuse_analyses(self, files: List[Path], analysis_id: str,
+                        reuse: Dict[str, str]) -> List[FileAnalysis]:
+        """Load cached analyses of unchanged files without reading them."""
+        results = []
+        for file_path in files:
+            key = reuse.get(str(file_path))
+            analysis = self._load_fingerprint(key, file_path) if key else None
+            if analysis:
+                self._adopt_result(analysis, file_path, analysis_id)
+                self._record_fingerprint(file_path, key)
+                results.append(analysis)
+        return results
+    
+    def _thread_pool_analyze(self, files: List[Path], analysis_id: str) -> List[FileAnalysis]:
+        """
+        Analyze files on a thread pool.
+        
         Args:
             files: List of file paths to analyze
             analysis_id: Analysis identifier
@@ -431,9 +976,10 @@ class RepositoryAnalyzer:
             for future in as_completed(future_to_file):
                 file_path = future_to_file[future]
                 try:
-                    result = future.result(timeout=60)  # 60 second timeout per file
+                    result = future.result()
                     if result:
                         results.append(result)
+                        self._maybe_flush_cache_writes(len(results))
                 except Exception as e:
                     failed_files.append((file_path, str(e)))
                     logger.error(f"Failed to analyze {file_path}: {e}")
@@ -443,6 +989,78 @@ class RepositoryAnalyzer:
         
         return results
     
+    def _process_pool_analyze(self, files: List[Path], analysis_id: str) -> List[FileAnalysis]:
+        """
+        Analyze files across worker processes, since AST parsing holds the GIL.
+        
+        Only paths are shipped; workers read, fingerprint, decode and parse each
+        file once, skipping the parse when their snapshot of the fingerprint
+        filter says this process may already hold the analysis. Returned
+        analyses are registered and cached in this process.
+        
+        Args:
+            files: List of file paths to analyze
+            analysis_id: Analysis identifier
+            
+        Returns:
+            List of file analysis results
+        """
+        results = []
+        failed_files = []
+        filter_bits = bytes(self._fingerprint_filter.bits) if self._fingerprint_filter is not None else None
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 mp_context=_POOL_MP_CONTEXT,
+                                 initializer=_init_worker,
+                                 initargs=(self.use_radon, filter_bits)) as executor:
+            future_to_file = {
+                executor.submit(_analyze_file_in_worker, str(f), analysis_id): f
+                for f in files
+            }
+            
+            for future in as_completed(future_to_file):
+                file_path = future_to_file[future]
+                try:
+                    prepared = future.result()
+                    result = self._adopt_worker_result(file_path, analysis_id, prepared) if prepared else None
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    failed_files.append((file_path, str(e)))
+                    logger.error(f"Failed to analyze {file_path}: {e}")
+                    continue
+                if result:
+                    results.append(result)
+                    self._maybe_flush_cache_writes(len(results))
+        
+        if failed_files:
+            logger.warning(f"Failed to analyze {len(failed_files)} files")
+        
+        return results
+    
+    def _adopt_worker_result(self, file_path: Path, analysis_id: str,
+                             prepared: Tuple[str, str, str, Optional[FileAnalysis]]) -> Optional[FileAnalysis]:
+        """Record, cache and register what a pool worker read and analyzed for file_path."""
+        fingerprint_key, content, encoding, result = prepared
+        self._record_fingerprint(file_path, fingerprint_key)
+        self._cache_set(self._file_cache_key("source", analysis_id, file_path), {
+            'content': content,
+            'encoding': encoding,
+            'path': str(file_path)
+        })
+        
+        if result is None:
+            # Worker deferred to the fingerprint cache; parse here on a filter false positive
+            result = self._load_fingerprint(fingerprint_key, file_path)
+            if result:
+                self._adopt_result(result, file_path, analysis_id)
+                return result
+            result = self._analyze_content(file_path, content, analysis_id, encoding)
+        else:
+            self._adopt_result(result, file_path, analysis_id)
+        self._store_fingerprint(fingerprint_key, result)
+        return result
+    
     def _analyze_file(self, file_path: Path, analysis_id: str) -> Optional[FileAnalysis]:
         """
         Analyze a single file with multi-language support.
@@ -455,106 +1073,143 @@ class RepositoryAnalyzer:
             File analysis result or None if failed
         """
         try:
-            # Read file with encoding detection
-            content, encoding = self._read_file_safely(file_path)
-            if content is None:
+            prepared = self._prepare_file(file_path, analysis_id)
+            if prepared is None:
                 return None
+            fingerprint_key, data, content, encoding, cached_result = prepared
+            if cached_result:
+                return cached_result
             
-            # Cache file content for source display
-            if self.cache:
-                cache_key = f"source:{analysis_id}:{file_path.name}"
-                self.cache.set(cache_key, {
-                    'content': content,
-                    'encoding': encoding,
-                    'path': str(file_path)
-                }, expire=3600)
-            
-            # Use universal analyzer if available
-            if MULTI_LANGUAGE_AVAILABLE:
-                universal_result = AnalyzerFactory.analyze_file_auto(file_path, content)
-                if universal_result:
-                    legacy_result = self._convert_universal_to_legacy(universal_result)
-                    
-                    # Cache file analysis
-                    if self.cache:
-                        self.cache.set(
-                            f"file:{analysis_id}:{file_path.name}", 
-                            legacy_result.to_dict(),
-                            expire=3600
-                        )
-                    
-                    return legacy_result
-            
-            # Fallback to Python-only analysis
-            if file_path.suffix.lower() in {'.py', '.pyw'}:
-                return self._analyze_python_file_legacy(file_path, content, analysis_id, encoding)
-            else:
-                logger.debug(f"Unsupported file type for legacy analysis: {file_path}")
-                return None
+            result = self._analyze_content(file_path, content, analysis_id, encoding, data)
+            self._store_fingerprint(fingerprint_key, result)
+            return result
                 
         except Exception as e:
             logger.error(f"Error processing {file_path}: {e}")
             return None
     
-    def _analyze_python_file_legacy(self, file_path: Path, content: str, analysis_id: str, encoding: str) -> Optional[FileAnalysis]:
-        """Legacy Python file analysis for fallback."""
+    def _prepare_file(self, file_path: Path, analysis_id: str) -> Optional[Tuple[str, bytes, str, str, Optional[FileAnalysis]]]:
+        """
+        Read, fingerprint and decode a file, caching its source for display.
+        
+        Args:
+            file_path: Path to file
+            analysis_id: Analysis identifier
+            
+        Returns:
+            Tuple of (fingerprint_key, data, content, encoding, cached_result) or None
+            if the file cannot be read; cached_result is already registered
+            when the fingerprint cache holds this content
+        """
+        # Fingerprint raw bytes so unchanged files skip parsing entirely
+        data = self._read_bytes_safely(file_path)
+        if data is None:
+            return None
+        fingerprint_key = self._fingerprint_key(data, file_path)
+        self._record_fingerprint(file_path, fingerprint_key)
+        
+        # Decode with encoding detection
+        content, encoding = self._decode_content(data)
+        if content is None:
+            return None
+        
+        # Cache file content for source display
+        self._cache_set(self._file_cache_key("source", analysis_id, file_path), {
+            'content': content,
+            'encoding': encoding,
+            'path': str(file_path)
+        })
+        
+        cached_result = self._load_fingerprint(fingerprint_key, file_path)
+        if cached_result:
+            self._adopt_result(cached_result, file_path, analysis_id)
+        return fingerprint_key, data, content, encoding, cached_result
+    
+    def _analyze_content(self, file_path: Path, content: str, analysis_id: str, encoding: str,
+                         data: Optional[bytes] = None) -> Optional[FileAnalysis]:
+        """Parse and analyze decoded file content."""
+        # Use universal analyzer if available
+        if MULTI_LANGUAGE_AVAILABLE:
+            universal_result = AnalyzerFactory.analyze_file_auto(file_path, content)
+            if universal_result:
+                legacy_result = self._convert_universal_to_legacy(universal_result)
+                
+                # Cache file analysis
+                self._cache_set(self._file_cache_key("file", analysis_id, file_path), legacy_result.to_dict())
+                
+                return legacy_result
+        
+        # Fallback to Python-only analysis
+        if file_path.suffix.lower() in {'.py', '.pyw'}:
+            return self._analyze_python_file_legacy(file_path, content, analysis_id, encoding, data)
+        else:
+            logger.debug(f"Unsupported file type for legacy analysis: {file_path}")
+            return None
+    
+    def _file_cache_key(self, kind: str, analysis_id: str, file_path: Path) -> str:
+        """
+        Cache key of a file's analysis or source: "{kind}:{analysis_id}:{path}".
+        
+        The path is relative to the repository root while analyze_local runs,
+        so same-named files in different directories get their own entries;
+        otherwise it is just the file name.
+        """
+        root = self._analysis_roots.get(analysis_id)
+        if root is not None:
+            try:
+                return f"{kind}:{analysis_id}:{file_path.relative_to(root)}"
+            except ValueError:
+                pass
+        return f"{kind}:{analysis_id}:{file_path.name}"
+    
+    def _adopt_result(self, analysis: FileAnalysis, file_path: Path, analysis_id: str):
+        """Register and cache an analysis produced elsewhere (fingerprint hit, pool worker)."""
+        self._register_nodes(analysis.nodes)
+        self._cache_set(self._file_cache_key("file", analysis_id, file_path), analysis.to_dict())
+    
+    def _analyze_python_file_legacy(self, file_path: Path, content: str, analysis_id: str, encoding: str,
+                                    data: Optional[bytes] = None) -> Optional[FileAnalysis]:
+        """Legacy Python file analysis for fallback (data: raw bytes of content, if at hand)."""
         try:
-            # Parse AST
-            tree = ast.parse(content, filename=str(file_path))
+            # Parse AST; UTF-8 bytes go straight to the parser without a str round trip
+            utf8_source = data is not None and encoding in ('utf-8', 'utf-8-sig')
+            tree = ast.parse(data if utf8_source else content, filename=str(file_path))
             
             # Calculate file hash and metadata
-            file_hash = hashlib.md5(content.encode()).hexdigest()
-            file_size = file_path.stat().st_size
-            
-            # Extract AST information
-            nodes = []
-            imports = []
-            classes = []
-            functions = []
-            
-            # Visit all nodes
-            for node in ast.walk(tree):
-                node_data = self._process_node(node, str(file_path))
-                if node_data:
-                    with self._lock:
-                        self.node_registry[node_data.id] = node_data
-                    nodes.append(node_data)
-                    
-                    # Categorize nodes
-                    if isinstance(node, ast.Import):
-                        imports.extend(alias.name for alias in node.names)
-                    elif isinstance(node, ast.ImportFrom):
-                        module_name = node.module or ''
-                        if module_name:
-                            imports.append(module_name)
-                    elif isinstance(node, ast.ClassDef):
-                        classes.append(node.name)
-                    elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        functions.append(node.name)
-            
-            # Calculate complexity
-            complexity = self._calculate_complexity(content)
+            if data is None:
+                data = content.encode()
+                file_size = file_path.stat().st_size
+            else:
+                file_size = len(data)
+            file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+            
+            # Extract nodes, symbols and complexity in a single traversal
+            visitor = _LegacyPythonVisitor.for_file(self, str(file_path))
+            visitor.visit(tree)
+            nodes = list(visitor.nodes)  # Copied out: the visitor is reused
+            
+            self._register_nodes(nodes)
+            
+            if self.use_radon:
+                complexity = self._calculate_complexity(content, file_hash, tree)
+            else:
+                complexity = visitor.average_complexity()
             
             analysis = FileAnalysis(
                 path=str(file_path),
                 nodes=nodes,
-                imports=self._dedupe_list(imports),
-                classes=classes,
-                functions=functions,
+                imports=self._dedupe_list(visitor.imports),
+                classes=list(visitor.classes),
+                functions=list(visitor.functions),
                 complexity=complexity,
-                lines=len(content.splitlines()),
+                lines=content.count('\n') + (1 if content and not content.endswith('\n') else 0),
                 hash=file_hash,
                 size_bytes=file_size,
                 encoding=encoding
             )
             
             # Cache file analysis
-            if self.cache:
-                self.cache.set(
-                    f"file:{analysis_id}:{file_path.name}", 
-                    analysis.to_dict(),
-                    expire=3600
-                )
+            self._cache_set(self._file_cache_key("file", analysis_id, file_path), analysis.to_dict())
             
             return analysis
             
@@ -565,27 +1220,23 @@ class RepositoryAnalyzer:
             logger.error(f"Legacy Python analysis failed for {file_path}: {e}")
             return None
     
+    def _register_nodes(self, nodes: List[ASTNode]):
+        """Add a file's nodes to the registry under a single lock acquisition."""
+        with self._lock:
+            self.node_registry.update((node.id, node) for node in nodes)
+    
     def _convert_universal_to_legacy(self, universal: UniversalFileAnalysis) -> FileAnalysis:
         """Convert UniversalFileAnalysis to legacy FileAnalysis format."""
-        # Convert universal nodes to legacy ASTNode format
-        legacy_nodes = []
-        for universal_node in universal.nodes:
-            legacy_node = ASTNode(
-                id=universal_node.id,
-                type=universal_node.type,
-                name=universal_node.name,
-                file=universal_node.file,
-                line=universal_node.line,
-                col=universal_node.col,
-                children=universal_node.children,
-                properties=universal_node.properties or {},
-                complexity=universal_node.complexity
-            )
-            legacy_nodes.append(legacy_node)
-            
-            # Register in node registry for compatibility
-            with self._lock:
-                self.node_registry[legacy_node.id] = legacy_node
+        # Convert universal nodes to legacy ASTNode format (positional: id, type,
+        # name, file, line, col, children, properties, complexity)
+        legacy_nodes = [
+            ASTNode(u.id, u.type, u.name, u.file, u.line, u.col, u.children,
+                    u.properties or _EMPTY_PROPERTIES, u.complexity)
+            for u in universal.nodes
+        ]
+        
+        # Register in node registry for compatibility
+        self._register_nodes(legacy_nodes)
         
         return FileAnalysis(
             path=universal.path,
@@ -610,28 +1261,183 @@ class RepositoryAnalyzer:
         Returns:
             Tuple of (content, encoding) or (None, '') if failed
         """
+        data = self._read_bytes_safely(file_path)
+        if data is None:
+            return None, ''
+        return self._decode_content(data)
+    
+    def _read_bytes_safely(self, file_path: Path) -> Optional[bytes]:
+        """Read raw file bytes, logging and returning None on failure."""
+        try:
+            return file_path.read_bytes()
+        except Exception as e:
+            logger.error(f"Error reading {file_path}: {e}")
+            return None
+    
+    def _decode_content(self, data: bytes) -> Tuple[Optional[str], str]:
+        """
+        Decode file bytes with encoding detection.
+        
+        Args:
+            data: Raw file contents
+            
+        Returns:
+            Tuple of (content, encoding) or (None, '') if no encoding fits
+        """
         encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
         
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                return content, encoding
+                content = data.decode(encoding)
             except UnicodeDecodeError:
                 continue
-            except Exception as e:
-                logger.error(f"Error reading {file_path}: {e}")
-                break
+            # Match text-mode reads, which translate universal newlines
+            return content.replace('\r\n', '\n').replace('\r', '\n'), encoding
         
         return None, ''
     
-    def _process_node(self, node: ast.AST, file_path: str) -> Optional[ASTNode]:
+    def _fingerprint_key(self, data: bytes, file_path: Path) -> str:
+        """Cache key for a file analysis: content digest plus extension (language)."""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return f"fa:{digest}:{file_path.suffix.lower()}"
+    
+    def _load_fingerprint(self, key: str, file_path: Path) -> Optional[FileAnalysis]:
+        """
+        Return a cached analysis for byte-identical content, rebound to file_path.
+        
+        Args:
+            key: Fingerprint cache key
+            file_path: Path the analysis should be reported under
+            
+        Returns:
+            Cached file analysis or None on miss
+        """
+        if not self.cache:
+            return None
+        if self._fingerprint_filter is not None and key not in self._fingerprint_filter:
+            # Another process may have stored it since the filter was loaded
+            if not self._refresh_fingerprint_filter() or key not in self._fingerprint_filter:
+                return None
+        data = self.cache.get(key)
+        if not isinstance(data, dict):
+            return None
+        
+        try:
+            analysis = FileAnalysis.from_dict(data)
+        except (KeyError, TypeError) as e:
+            logger.debug(f"Discarding malformed fingerprint entry {key}: {e}")
+            return None
+        
+        # Same bytes may live at another path (moved file, fresh clone); node ids
+        # embed the path (universal analyzers prefix it, _process_node digests
+        # it), so recompute them as a fresh analysis of new_path would
+        old_path, new_path = analysis.path, str(file_path)
+        if old_path != new_path:
+            old_prefix, new_ids = f"{old_path}:", {}
+            for node in analysis.nodes:
+                if node.id.startswith(old_prefix):
+                    new_id = f"{new_path}:{node.id[len(old_prefix):]}"
+                else:
+                    new_id = _node_id_digest(f"{new_path}:{node.line}:{node.col}:{node.type}".encode())
+                new_ids[node.id] = node.id = new_id
+                node.file = new_path
+            
+            analysis.path = new_path
+            for node in analysis.nodes:
+                if node.children:
+                    node.children = [new_ids.get(child, child) for child in node.children]
+        
+        return analysis
+    
+    def _record_fingerprint(self, file_path: Path, key: str):
+        """Note a file's fingerprint key while analyze_local is indexing them."""
+        if self._fingerprint_index is not None:
+            self._fingerprint_index[str(file_path)] = key
+    
+    def _store_fingerprint(self, key: str, analysis: Optional[FileAnalysis]):
+        """Persist a fresh analysis under its content fingerprint."""
+        if analysis:
+            self._cache_set(key, analysis.to_dict(), expire=self.FINGERPRINT_TTL)
+            if self._fingerprint_filter is not None:
+                with self._lock:
+                    self._fingerprint_filter.add(key)
+                    self._fingerprint_filter_dirty = True
+    
+    def _load_fingerprint_filter(self) -> _BloomFilter:
+        """Load the persisted fingerprint filter, or start an empty one."""
+        # Version first: a save landing in between is merged again on refresh
+        self._fingerprint_filter_version = self.cache.get(self.FINGERPRINT_FILTER_VERSION_KEY)
+        bits = self.cache.get(self.FINGERPRINT_FILTER_KEY)
+        return _BloomFilter(self.FINGERPRINT_FILTER_CAPACITY, self.FINGERPRINT_FILTER_ERROR_RATE,
+                            bits if isinstance(bits, (bytes, bytearray)) else None)
+    
+    def _refresh_fingerprint_filter(self) -> bool:
+        """Merge in fingerprint filter bits saved by other processes; True if there were any."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._fingerprint_filter_checked < self.FINGERPRINT_FILTER_REFRESH_INTERVAL:
+                return False
+            self._fingerprint_filter_checked = now
+        
+        version = self.cache.get(self.FINGERPRINT_FILTER_VERSION_KEY)
+        if version is None or version == self._fingerprint_filter_version:
+            return False
+        stored = self.cache.get(self.FINGERPRINT_FILTER_KEY)
+        if not isinstance(stored, (bytes, bytearray)):
+            return False
+        with self._lock:
+            self._fingerprint_filter.merge(stored)
+            self._fingerprint_filter_version = version
+        return True
+    
+    def _persist_fingerprint_filter(self):
+        """Save the fingerprint filter if keys were added, merging other writers' bits."""
+        if self._fingerprint_filter is None or not self._fingerprint_filter_dirty:
+            return
+        with self._lock:
+            stored = self.cache.get(self.FINGERPRINT_FILTER_KEY)
+            if isinstance(stored, (bytes, bytearray)):
+                self._fingerprint_filter.merge(stored)
+            bits = bytes(self._fingerprint_filter.bits)
+            self._fingerprint_filter_dirty = False
+            self._fingerprint_filter_version = version = os.urandom(8).hex()
+        self.cache.set(self.FINGERPRINT_FILTER_KEY, bits, expire=self.FINGERPRINT_TTL)
+        self.cache.set(self.FINGERPRINT_FILTER_VERSION_KEY, version, expire=self.FINGERPRINT_TTL)
+    
+    def _cache_set(self, key: str, value: Any, expire: int = 3600):
+        """Write to the cache, or queue the write while a batch is open."""
+        if not self.cache:
+            return
+        with self._lock:
+            if self._write_batch is not None:
+                self._write_batch.setdefault(expire, {})[key] = value
+                return
+        self.cache.set(key, value, expire=expire)
+    
+    def _maybe_flush_cache_writes(self, analyzed_count: int):
+        """Flush queued writes every CACHE_FLUSH_INTERVAL analyzed files."""
+        if analyzed_count % self.CACHE_FLUSH_INTERVAL == 0:
+            self._flush_cache_writes()
+    
+    def _flush_cache_writes(self):
+        """Send queued cache writes, one set_many per expiry, keeping the batch open."""
+        with self._lock:
+            batch = self._write_batch
+            if batch is not None:
+                self._write_batch = {}
+        for expire, items in (batch or {}).items():
+            self.cache.set_many(items, expire=expire)
+    
+    def _process_node(self, node: ast.AST, file_path: str,
+                      compute_complexity: bool = True) -> Optional[ASTNode]:
         """
         Process individual AST node with comprehensive property extraction.
         
         Args:
             node: AST node
             file_path: File path containing the node
+            compute_complexity: Walk function bodies for complexity; callers
+                that track complexity during their own traversal pass False
             
         Returns:
             Processed AST node or None
@@ -639,96 +1445,127 @@ class RepositoryAnalyzer:
         if not hasattr(node, 'lineno'):
             return None
         
-        # MEMORY OPTIMIZATION: Use interned strings and efficient ID generation
-        class_name = self._intern_string(node.__class__.__name__)
+        # Type-level lookups replace per-node isinstance/hasattr chains
+        node_type = type(node)
+        class_name, name_attr, essential_fields, is_function = (
+            _NODE_SPECS.get(node_type) or _node_spec(node_type))
         col_offset = getattr(node, 'col_offset', 0)
         
-        # More memory-efficient node ID generation
-        node_id_parts = (file_path, str(node.lineno), str(col_offset), class_name)
-        node_id_str = ':'.join(node_id_parts)
-        node_id = hashlib.md5(node_id_str.encode('utf-8')).hexdigest()[:12]
+        # Fast non-cryptographic node ID (ids only need to be unique, not secure)
+        node_id = _node_id_digest(f"{file_path}:{node.lineno}:{col_offset}:{class_name}".encode())
         
-        # MEMORY OPTIMIZATION: Extract only essential properties to reduce memory usage
-        properties = {}
-        essential_fields = {'name', 'id', 'arg', 'attr', 'value'}  # Only store essential fields
-        for field in node._fields:
-            if field in essential_fields:
+        # MEMORY OPTIMIZATION: Extract only essential properties to reduce memory usage;
+        # nodes without any share one read-only empty mapping
+        properties = _EMPTY_PROPERTIES
+        if essential_fields:
+            found = {}
+            for field in essential_fields:
                 try:
                     value = getattr(node, field, None)
                     if value is not None and not isinstance(value, (ast.AST, list)):
                         # Intern string values to save memory
-                        properties[field] = self._intern_string(str(value))
+                        found[field] = self._intern_string(str(value))
                 except Exception:
                     continue
+            if found:
+                properties = found
         
         # MEMORY OPTIMIZATION: Get node name efficiently with interning
         name = None
-        for attr in ['name', 'id', 'arg']:
-            if hasattr(node, attr):
-                name = self._intern_string(str(getattr(node, attr)))
-                break
+        if name_attr and hasattr(node, name_attr):
+            name = self._intern_string(str(getattr(node, name_attr)))
         
         # Calculate complexity for functions/methods
         complexity = None
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        if compute_complexity and is_function:
             complexity = self._get_node_complexity(node)
         
         return ASTNode(
             id=node_id,
-            type=node.__class__.__name__,
+            type=class_name,
             name=name,
             file=file_path,
             line=node.lineno,
             col=getattr(node, 'col_offset', 0),
-            children=[],  # Will be populated later if needed
+            children=_EMPTY_CHILDREN,
             properties=properties,
             complexity=complexity
         )
     
-    def _calculate_complexity(self, code: str) -> float:
+    def _calculate_complexity(self, code: str, code_hash: Optional[str] = None,
+                              tree: Optional[ast.AST] = None) -> float:
         """
         Calculate cyclomatic complexity using radon if available.
         
         Args:
             code: Source code string
+            code_hash: Precomputed content digest used as the memo key
+            tree: Already parsed module for code, reused instead of re-parsing
             
         Returns:
             Average complexity score
         """
+        if code_hash is None:
+            code_hash = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+        
+        with _cc_cache_lock:
+            if code_hash in _cc_cache:
+                _cc_cache.move_to_end(code_hash)
+                return _cc_cache[code_hash]
+        
+        complexity = self._uncached_complexity(code, tree)
+        
+        with _cc_cache_lock:
+            _cc_cache[code_hash] = complexity
+            if len(_cc_cache) > _CC_CACHE_SIZE:
+                _cc_cache.popitem(last=False)
+        return complexity
+    
+    def _uncached_complexity(self, code: str, tree: Optional[ast.AST] = None) -> float:
+        """Radon average complexity, or the simple estimate without radon."""
         if not RADON_AVAILABLE:
-            return self._simple_complexity(code)
+            return self._simple_complexity(code, tree)
         
         try:
-            cc_results = radon_cc.cc_visit(code)
+            if tree is not None:
+                cc_results = radon_cc.cc_visit_ast(tree)
+            else:
+                cc_results = radon_cc.cc_visit(code)
             if cc_results:
                 total_complexity = sum(item.complexity for item in cc_results)
                 return total_complexity / len(cc_results)
             return 1.0
         except Exception:
-            return self._simple_complexity(code)
+            return self._simple_complexity(code, tree)
+    
+    def clear_caches(self):
+        """Drop process-wide memoized results (for long-running servers)."""
+        with _cc_cache_lock:
+            _cc_cache.clear()
     
-    def _simple_complexity(self, code: str) -> float:
+    def _simple_complexity(self, code, tree: Optional[ast.AST] = None) -> float:
         """
         Simple complexity calculation fallback.
         
         Args:
-            code: Source code string
+            code: Source code (str or bytes)
+            tree: Already parsed module for code, if available
             
         Returns:
             Estimated complexity score
         """
+        if tree is None:
+            # No tree at hand: count decision keywords instead of parsing,
+            # which also covers sources that do not parse at all
+            code_bytes = code.encode('utf-8', 'replace') if isinstance(code, str) else code
+            decisions = len(_CC_TOKEN_RE.findall(code_bytes))
+            return max(1.0, decisions / max(1, code_bytes.count(b'\n')))
+        
         try:
-            tree = ast.parse(code)
-            complexity = 0
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.If, ast.While, ast.For, ast.ExceptHandler,
-                                   ast.With, ast.Assert, ast.Try)):
-                    complexity += 1
-                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                    complexity += 1
-                    
-            return max(1.0, complexity / max(1, len(list(ast.walk(tree)))))
+            codes = _encode_node_types(tree)
+            complexity = _cc_kernel(codes, _SIMPLE_CC_WEIGHTS)
+            
+            return max(1.0, complexity / max(1, len(codes)))
         except:
             return 1.0
     
@@ -742,17 +1579,8 @@ class RepositoryAnalyzer:
         Returns:
             Complexity score for the node
         """
-        complexity = 1  # Base complexity
-        
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                complexity += 1
-            elif isinstance(child, (ast.BoolOp, ast.Compare)):
-                complexity += 1
-            elif isinstance(child, ast.Try):
-                complexity += len(child.handlers)
-        
-        return complexity
+        # Base complexity plus weighted decision points
+        return 1 + _cc_kernel(_encode_node_types(node), _NODE_CC_WEIGHTS)
     
     def _generate_summary(self, results: List[FileAnalysis]) -> Dict:
         """
@@ -772,11 +1600,8 @@ class RepositoryAnalyzer:
         total_functions = sum(len(f.functions) for f in results)
         complexities = [f.complexity for f in results if f.complexity > 0]
         
-        # MEMORY OPTIMIZATION: Efficiently collect unique imports without intermediate sets
-        import_counter = {}
-        for f in results:
-            for imp in f.imports:
-                import_counter[imp] = import_counter.get(imp, 0) + 1
+        # Unique imports collected in one C-level pass
+        unique_imports = set(chain.from_iterable(f.imports for f in results))
         
         return {
             'total_files': len(results),
@@ -784,22 +1609,29 @@ class RepositoryAnalyzer:
             'total_classes': total_classes,
             'total_functions': total_functions,
             'average_complexity': sum(complexities) / len(complexities) if complexities else 0,
-            'imports': sorted(import_counter.keys())[:100],  # Limit for performance
+            'imports': heapq.nsmallest(100, unique_imports),  # Limit for performance
             'file_size_distribution': self._get_size_distribution(results),
-            'top_complex_files': sorted(
-                [(f.path, f.complexity) for f in results], 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:10]
+            'top_complex_files': [
+                (f.path, f.complexity)
+                for f in heapq.nlargest(10, results, key=attrgetter('complexity'))
+            ]
         }
     
     def _get_size_distribution(self, results: List[FileAnalysis]) -> Dict[str, int]:
         """Get file size distribution statistics."""
-        sizes = [f.lines for f in results]
+        # One pass over results instead of one list per bucket
+        small = medium = large = 0
+        for f in results:
+            if f.lines < 100:
+                small += 1
+            elif f.lines < 500:
+                medium += 1
+            else:
+                large += 1
         return {
-            'small_files': len([s for s in sizes if s < 100]),
-            'medium_files': len([s for s in sizes if 100 <= s < 500]),
-            'large_files': len([s for s in sizes if s >= 500])
+            'small_files': small,
+            'medium_files': medium,
+            'large_files': large
         }
     
     def _calculate_metrics(self, results: List[FileAnalysis]) -> Dict:
@@ -824,24 +1656,24 @@ class RepositoryAnalyzer:
             'import_graph': self._build_import_graph(results)
         }
         
-        # Sort by complexity
-        complexity_sorted = sorted(results, key=lambda x: x.complexity, reverse=True)[:10]
+        # Top 10 by complexity (nlargest: O(N log 10), same order as a stable reverse sort)
+        complexity_sorted = heapq.nlargest(10, results, key=attrgetter('complexity'))
         metrics['files_by_complexity'] = [
-            {'file': Path(f.path).name, 'complexity': f.complexity} 
+            {'file': _path_name(f.path), 'complexity': f.complexity} 
             for f in complexity_sorted
         ]
         
-        # Sort by size
-        size_sorted = sorted(results, key=lambda x: x.lines, reverse=True)[:10]
+        # Top 10 by size
+        size_sorted = heapq.nlargest(10, results, key=attrgetter('lines'))
         metrics['largest_files'] = [
-            {'file': Path(f.path).name, 'lines': f.lines} 
+            {'file': _path_name(f.path), 'lines': f.lines} 
             for f in size_sorted
         ]
         
-        # Sort by imports
-        import_sorted = sorted(results, key=lambda x: len(x.imports), reverse=True)[:10]
+        # Top 10 by imports
+        import_sorted = heapq.nlargest(10, results, key=lambda x: len(x.imports))
         metrics['most_imports'] = [
-            {'file': Path(f.path).name, 'imports': len(f.imports)} 
+            {'file': _path_name(f.path), 'imports': len(f.imports)} 
             for f in import_sorted
         ]
         
@@ -858,23 +1690,17 @@ class RepositoryAnalyzer:
             Import graph as adjacency list
         """
         graph = {}
-        file_modules = {Path(f.path).stem for f in results}
-        
-        for file_analysis in results:
-            file_stem = Path(file_analysis.path).stem
-            dependencies = []
-            
-            for imp in file_analysis.imports:
-                # Check if import is a local module
-                if imp in file_modules:
-                    dependencies.append(imp)
-                # Handle relative imports
-                elif '.' in imp:
-                    base_module = imp.split('.')[0]
-                    if base_module in file_modules:
-                        dependencies.append(base_module)
-            
-            graph[file_stem] = dependencies
+        stems = [_path_stem(f.path) for f in results]
+        file_modules = set(stems)
+        
+        for file_analysis, file_stem in zip(results, stems):
+            # Local modules imported directly or as the root of a dotted
+            # import, matched with C-level set operations (sorted: set order
+            # is not stable across runs)
+            imports = file_analysis.imports
+            candidates = set(imports)
+            candidates.update(map(_import_root, imports))
+            graph[file_stem] = sorted(candidates & file_modules)
         
         return graph
     
@@ -889,77 +1715,138 @@ class RepositoryAnalyzer:
         Returns:
             Visualization-ready data
         """
-        nodes = []
-        edges = []
+        # Analyses are immutable once cached, so the payload for an id can be
+        # reused; inline 'files' data is caller-provided and never memoized
+        memoize = bool(analysis_id) and 'files' not in analysis_data
+        if memoize:
+            cached = self._cached_visualization(analysis_id)
+            if cached is not None:
+                return cached
         
         # Create nodes for files - handle both direct files array and chunked storage
-        files_data = []
+        columns = self._rows_to_columns([])
         
         # First try to get files directly from analysis_data (backward compatibility)
         if 'files' in analysis_data:
-            files_data = analysis_data['files']
+            columns = self._rows_to_columns(analysis_data['files'])
         else:
             # Reconstruct files from chunks if we have cache and analysis_id
             if self.cache and analysis_id:
-                chunk_index = 0
-                while True:
-                    chunk_key = f"files:{analysis_id}:{chunk_index}"
-                    chunk_data = self.cache.get(chunk_key)
-                    if not chunk_data:
-                        break
-                    files_data.extend(chunk_data)
-                    chunk_index += 1
-                    
-                    # Safety limit to prevent infinite loops
-                    if chunk_index > 100:  # Max 5000 files (50 per chunk * 100 chunks)
-                        logger.warning(f"Reached maximum chunk limit for analysis {analysis_id}")
-                        break
+                columns = self._load_file_chunks(analysis_id)
         
         # Create nodes for files
-        for file_data in files_data:
-            file_path = file_data['path']
-            file_name = Path(file_path).name
-            
-            # Handle both list and integer formats for classes/functions
-            classes_data = file_data.get('classes', [])
-            functions_data = file_data.get('functions', [])
-            
-            # If they're already integers (from compact storage), use them directly
-            # Otherwise, get the length of the list
-            classes_count = classes_data if isinstance(classes_data, int) else len(classes_data)
-            functions_count = functions_data if isinstance(functions_data, int) else len(functions_data)
-            
-            nodes.append({
+        nodes = [
+            {
                 'id': file_path,
-                'label': file_name,
+                'label': _path_name(file_path),
                 'type': 'file',
                 'metrics': {
-                    'lines': file_data['lines'],
-                    'complexity': file_data['complexity'],
+                    'lines': lines,
+                    'complexity': complexity,
                     'classes': classes_count,
                     'functions': functions_count,
-                    'size_bytes': file_data.get('size_bytes', 0)
+                    'size_bytes': size_bytes
                 }
-            })
+            }
+            for file_path, lines, complexity, classes_count, functions_count, size_bytes in zip(
+                columns['path'], columns['lines'], columns['complexity'],
+                columns['classes'], columns['functions'], columns['size_bytes'])
+        ]
         
         # Create edges for imports
         import_graph = analysis_data.get('metrics', {}).get('import_graph', {})
-        for source, targets in import_graph.items():
-            for target in targets:
-                edges.append({
-                    'source': source,
-                    'target': target,
-                    'type': 'import'
-                })
+        edges = [
+            {
+                'source': source,
+                'target': target,
+                'type': 'import'
+            }
+            for source, targets in import_graph.items()
+            for target in targets
+        ]
         
         logger.info(f"Prepared visualization with {len(nodes)} nodes and {len(edges)} edges")
         
-        return {
+        visualization = {
             'nodes': nodes,
             'edges': edges,
             'summary': analysis_data.get('summary', {}),
             'metrics': analysis_data.get('metrics', {})
         }
+        if memoize:
+            self._remember_visualization(analysis_id, visualization)
+        return visualization
+    
+    def _cached_visualization(self, analysis_id: str) -> Optional[Dict]:
+        """Memoized visualization payload for analysis_id, from this process or the cache."""
+        with self._lock:
+            entry = self._viz_cache.get(analysis_id)
+            if entry is not None:
+                if time.time() - entry[0] < self.VISUALIZATION_TTL:
+                    self._viz_cache.move_to_end(analysis_id)
+                    return entry[1]
+                del self._viz_cache[analysis_id]
+        
+        visualization = self.cache.get(f"viz:{analysis_id}") if self.cache else None
+        if not isinstance(visualization, dict):
+            return None
+        self._remember_visualization(analysis_id, visualization, persist=False)
+        return visualization
+    
+    def _remember_visualization(self, analysis_id: str, visualization: Dict, persist: bool = True):
+        """Memoize a visualization payload; persisted so restarts start warm."""
+        with self._lock:
+            self._viz_cache[analysis_id] = (time.time(), visualization)
+            self._viz_cache.move_to_end(analysis_id)
+            while len(self._viz_cache) > self.VISUALIZATION_CACHE_SIZE:
+                self._viz_cache.popitem(last=False)
+        if persist and self.cache:
+            self.cache.set(f"viz:{analysis_id}", visualization, expire=self.VISUALIZATION_CACHE_EXPIRE)
+    
+    def _load_file_chunks(self, analysis_id: str) -> Dict[str, List[Any]]:
+        """
+        Reassemble the compact file list that analyze_local stored in chunks.
+        
+        Args:
+            analysis_id: Analysis identifier
+            
+        Returns:
+            File columns (see _files_to_columns) in analysis order
+        """
+        # Safety limit: max ~5000 files (50 per chunk * 101 chunks)
+        max_chunks = 101
+        files_data = self._rows_to_columns([])
+        
+        def extend(chunk_data):
+            # Chunks written before the column layout hold per-file dicts
+            if isinstance(chunk_data, list):
+                chunk_data = self._rows_to_columns(chunk_data)
+            for name, column in files_data.items():
+                column.extend(chunk_data[name])
+        
+        chunk_count = self.cache.get(f"files:{analysis_id}:_count")
+        if isinstance(chunk_count, int):
+            # Known chunk count: fetch every chunk in one round trip
+            keys = [f"files:{analysis_id}:{i}" for i in range(min(chunk_count, max_chunks))]
+            chunks = self.cache.get_many(keys)
+            for key in keys:
+                chunk_data = chunks.get(key)
+                if not chunk_data:
+                    break
+                extend(chunk_data)
+            if chunk_count > max_chunks:
+                logger.warning(f"Reached maximum chunk limit for analysis {analysis_id}")
+        else:
+            # Analyses cached before the count was stored: probe chunk by chunk
+            for chunk_index in range(max_chunks):
+                chunk_data = self.cache.get(f"files:{analysis_id}:{chunk_index}")
+                if not chunk_data:
+                    break
+                extend(chunk_data)
+            else:
+                logger.warning(f"Reached maximum chunk limit for analysis {analysis_id}")
+        
+        return files_data
     
     def _cache_source_files(self, repo_path: Path, analysis_id: str):
         """Cache source files for temporary Git repositories."""
@@ -968,69 +1855,91 @@ class RepositoryAnalyzer:
             
         logger.info(f"Caching source files for temporary repository: {analysis_id}")
         
-        # Find all Python files and cache their content
-        for file_path in repo_path.rglob('*.py'):
-            if self._should_analyze_file(file_path):
-                try:
-                    relative_path = file_path.relative_to(repo_path)
-                    
-                    # Read file content with encoding handling
-                    encodings = ['utf-8', 'latin-1', 'cp1252']
-                    content = None
-                    encoding_used = 'utf-8'
-                    
-                    for encoding in encodings:
-                        try:
-                            with open(file_path, 'r', encoding=encoding) as f:
-                                content = f.read()
-                                encoding_used = encoding
-                                break
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    if content is not None:
-                        source_data = {
-                            'source': content,
-                            'encoding': encoding_used,
-                            'lines': content.count('\n') + 1,
-                            'size': file_path.stat().st_size,
-                            'path': str(relative_path)
-                        }
-                        
-                        # Cache with multiple key patterns for easy retrieval
-                        cache_keys = [
-                            f"source:{analysis_id}:{relative_path}",
-                            f"source:{analysis_id}:{relative_path.name}",
-                            f"source:{analysis_id}:{file_path}",  # Full original path
-                        ]
-                        
-                        for cache_key in cache_keys:
-                            self.cache.set(cache_key, source_data, expire=7200)
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to cache source for {file_path}: {e}")
+        # Find all Python files; the scan prunes excluded directories instead
+        # of checking every file's path parts
+        file_paths = [
+            Path(entry.path) for entry in self._scan_candidate_files(repo_path)
+            if self._should_analyze_entry(entry)
+        ]
+        
+        # Reads are I/O bound: overlap them on threads, then write the cache
+        # entries from this thread in pipelined batches
+        batch = {}
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = executor.map(lambda p: self._load_source(p, repo_path, analysis_id), file_paths)
+            for count, entries in enumerate(loaded, 1):
+                batch.update(entries)
+                if count % self.CACHE_FLUSH_INTERVAL == 0:
+                    self.cache.set_many(batch, expire=7200)
+                    batch = {}
+        self.cache.set_many(batch, expire=7200)
                     
         logger.info(f"Source file caching completed for analysis: {analysis_id}")
     
-    def _should_analyze_file(self, file_path: Path) -> bool:
-        """Check if a file should be analyzed based on extension and size."""
-        # Check file extension
-        if file_path.suffix not in self.ALLOWED_EXTENSIONS:
-            return False
+    def _load_source(self, file_path: Path, repo_path: Path, analysis_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Read one source file for _cache_source_files.
+        
+        Args:
+            file_path: Path to the source file
+            repo_path: Repository root
+            analysis_id: Analysis identifier
             
-        # Check file size (skip very large files)
+        Returns:
+            Source cache entries keyed by every lookup pattern, or {} on failure
+        """
         try:
-            if file_path.stat().st_size > 10 * 1024 * 1024:  # 10MB limit
-                return False
-        except OSError:
-            return False
+            relative_path = file_path.relative_to(repo_path)
             
-        # Check if it's in excluded directories
-        for part in file_path.parts:
-            if part in self.EXCLUDED_DIRS:
-                return False
+            raw = file_path.read_bytes()
+            
+            # Count lines on bytes (memchr) rather than scanning the decoded str;
+            # lone CRs count too, as text-mode reads translate them to newlines
+            lines = raw.count(b'\n') + 1
+            if b'\r' in raw:
+                lines += raw.count(b'\r') - raw.count(b'\r\n')
+            
+            # Decode once: UTF-8 (BOM stripped) or latin-1, which accepts any byte sequence
+            encoding_used = 'utf-8-sig' if raw.startswith(codecs.BOM_UTF8) else 'utf-8'
+            try:
+                content = raw.decode(encoding_used)
+            except UnicodeDecodeError:
+                encoding_used = 'latin-1'
+                content = raw.decode(encoding_used)
+            
+            # Match text-mode reads, which translate universal newlines
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            
+            source_data = {
+                'source': content,
+                'encoding': encoding_used,
+                'lines': lines,
+                'size': len(raw),
+                'path': str(relative_path)
+            }
+            
+            # Cache with multiple key patterns for easy retrieval
+            cache_keys = [
+                f"source:{analysis_id}:{relative_path}",
+                f"source:{analysis_id}:{relative_path.name}",
+                f"source:{analysis_id}:{file_path}",  # Full original path
+            ]
+            return dict.fromkeys(cache_keys, source_data)
                 
-        return True
+        except Exception as e:
+            logger.warning(f"Failed to cache source for {file_path}: {e}")
+            return {}
+    
+    def _should_analyze_entry(self, entry: os.DirEntry) -> bool:
+        """Check a scanned file's extension and size (DirEntry caches the stat result)."""
+        if not entry.name.endswith('.py'):
+            return False
+        try:
+            return entry.stat().st_size <= 10 * 1024 * 1024  # 10MB limit
+        except OSError:
+            return False
     
     def search_nodes(self, analysis_id: str, query: str, node_type: str = '') -> List[Dict]:
         """
@@ -1073,67 +1982,118 @@ class RepositoryAnalyzer:
     
     def _node_matches_query(self, node_data: Dict, query: str) -> bool:
         """Check if node matches search query."""
-        searchable_fields = [
-            str(node_data.get('name', '')).lower(),
-            node_data.get('type', '').lower(),
-            str(node_data.get('properties', {})).lower()
-        ]
-        
-        return any(query in field for field in searchable_fields if field)
+        # Cheapest fields first; properties are only stringified if those miss
+        if query in str(node_data.get('name', '')).lower():
+            return True
+        if query in node_data.get('type', '').lower():
+            return True
+        return query in str(node_data.get('properties', {})).lower()
     
     # MEMORY OPTIMIZATION HELPER METHODS
     
     def _intern_string(self, s: str) -> str:
-        """Intern frequently used strings to save memory."""
-        if s not in self._string_cache:
-            self._string_cache[s] = sys.intern(s) if len(s) < 100 else s
-        return self._string_cache[s]
+        """Intern short strings in the interpreter table to save memory."""
+        return sys.intern(s) if len(s) < 100 else s
     
-    def _file_to_compact_dict(self, file_analysis: FileAnalysis) -> Dict[str, Any]:
-        """Convert file analysis to compact dictionary representation."""
+    def _files_to_columns(self, results: List[FileAnalysis]) -> Dict[str, List[Any]]:
+        """
+        Convert file analyses to a compact column-per-field representation.
+        
+        One list per field instead of one dict per file drops the repeated
+        keys from every cached row.
+        """
+        return {
+            'path': [f.path for f in results],
+            'lines': [f.lines for f in results],
+            'complexity': [round(f.complexity, 2) for f in results],
+            'classes': [len(f.classes) for f in results],
+            'functions': [len(f.functions) for f in results],
+            'imports': [len(f.imports) for f in results],
+            'size_bytes': [f.size_bytes for f in results],
+            'hash': [f.hash[:8] for f in results]  # Shortened hash
+        }
+    
+    def _rows_to_columns(self, rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Columns from per-file dicts (older cached chunks, inline 'files' lists)."""
+        def count(value) -> int:
+            # Compact rows store counts, full rows the lists themselves
+            # (exact type check: no isinstance MRO walk per field)
+            return value if type(value) is int else len(value)
+        
         return {
-            'path': file_analysis.path,
-            'lines': file_analysis.lines,
-            'complexity': round(file_analysis.complexity, 2),
-            'classes': len(file_analysis.classes),
-            'functions': len(file_analysis.functions),
-            'imports': len(file_analysis.imports),
-            'size_bytes': file_analysis.size_bytes,
-            'hash': file_analysis.hash[:8]  # Shortened hash
+            'path': [row['path'] for row in rows],
+            'lines': [row['lines'] for row in rows],
+            'complexity': [row['complexity'] for row in rows],
+            'classes': [count(row.get('classes', [])) for row in rows],
+            'functions': [count(row.get('functions', [])) for row in rows],
+            'imports': [count(row.get('imports', [])) for row in rows],
+            'size_bytes': [row.get('size_bytes', 0) for row in rows],
+            'hash': [row.get('hash', '')[:8] for row in rows]
         }
     
     def _extract_essential_nodes(self) -> Dict[str, Dict]:
         """Extract only essential node data for caching."""
-        essential_nodes = {}
-        
         # Only keep nodes that are likely to be searched or displayed
-        important_types = {'FunctionDef', 'ClassDef', 'AsyncFunctionDef', 'Import', 'ImportFrom'}
-        
-        for node_id, node in list(self.node_registry.items()):
-            if node and node.type in important_types:
-                essential_nodes[node_id] = {
-                    'type': node.type,
-                    'name': node.name,
-                    'file': node.file,
-                    'line': node.line,
-                    'complexity': node.complexity
-                }
-                
-                # Limit to prevent memory bloat
-                if len(essential_nodes) >= 1000:
-                    break
+        candidates = (
+            node for node in list(self.node_registry.values())
+            if node and node.type in _ESSENTIAL_NODE_TYPES
+        )
+        
+        # Limit to prevent memory bloat, keeping the most complex nodes
+        # rather than whichever the registry yields first
+        top_nodes = heapq.nlargest(self.MAX_ESSENTIAL_NODES, candidates,
+                                   key=lambda node: node.complexity or 0)
         
-        return essential_nodes
+        return {
+            node.id: {
+                'type': node.type,
+                'name': node.name,
+                'file': node.file,
+                'line': node.line,
+                'complexity': node.complexity
+            }
+            for node in top_nodes
+        }
     
     def _dedupe_list(self, items: List[str]) -> List[str]:
         """Efficiently remove duplicates while preserving order."""
-        if not items:
-            return []
-        
-        seen = set()
-        result = []
-        for item in items:
-            if item and item not in seen:
-                seen.add(item)
-                result.append(item)
-        return result
+        # dict.fromkeys dedupes in C and keeps first-seen order; filter drops empties
+        return list(dict.fromkeys(filter(None, items))) if items else []
+
+
+# Per-process analyzer and fingerprint filter snapshot for ProcessPoolExecutor
+# workers (see _process_pool_analyze)
+_worker_analyzer: Optional[RepositoryAnalyzer] = None
+_worker_fingerprint_filter: Optional[_BloomFilter] = None
+
+
+def _init_worker(use_radon: bool, filter_bits: Optional[bytes] = None) -> None:
+    """Pool initializer: build one cache-less analyzer per worker process."""
+    global _worker_analyzer, _worker_fingerprint_filter
+    _worker_analyzer = RepositoryAnalyzer(max_workers=1, use_radon=use_radon)
+    if filter_bits is not None:
+        _worker_fingerprint_filter = _BloomFilter(RepositoryAnalyzer.FINGERPRINT_FILTER_CAPACITY,
+                                                  RepositoryAnalyzer.FINGERPRINT_FILTER_ERROR_RATE,
+                                                  filter_bits)
+
+
+def _analyze_file_in_worker(file_path: str, analysis_id: str) -> Optional[Tuple[str, str, str, Optional[FileAnalysis]]]:
+    """
+    Read, fingerprint, decode and analyze one file in a worker.
+    
+    Returns (fingerprint_key, content, encoding, analysis) for the parent to
+    record, cache and register, or None if the file cannot be read or decoded;
+    analysis is None when the parent may already hold it under fingerprint_key.
+    """
+    analyzer = _worker_analyzer
+    path = Path(file_path)
+    data = analyzer._read_bytes_safely(path)
+    if data is None:
+        return None
+    fingerprint_key = analyzer._fingerprint_key(data, path)
+    content, encoding = analyzer._decode_content(data)
+    if content is None:
+        return None
+    if _worker_fingerprint_filter is not None and fingerprint_key in _worker_fingerprint_filter:
+        return fingerprint_key, content, encoding, None
+    return fingerprint_key, content, encoding, analyzer._analyze_content(path, content, analysis_id, encoding, data)
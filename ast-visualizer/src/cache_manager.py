@@ -4,15 +4,36 @@ Provides Redis-based caching with in-memory fallback
 """
 import json
 import redis
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 import pickle
 import logging
 from datetime import timedelta
 import os
 
+# Import orjson safely (faster JSON codec for Redis payloads)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps(value: Any) -> str:
+    """Serialize a JSON-compatible value to a compact string, via orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, separators=(',', ':'))
+
+
+def _loads(data: bytes) -> Any:
+    """Inverse of _dumps; raises json.JSONDecodeError on non-JSON payloads."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class CacheManager:
     """Manages caching for analysis results with Redis and memory fallback."""
     
@@ -67,7 +88,7 @@ class CacheManager:
             if self.use_redis:
                 # Use JSON for security instead of pickle
                 if isinstance(value, (dict, list, str, int, float, bool)):
-                    serialized = json.dumps(value)
+                    serialized = _dumps(value)
                     return bool(self.redis_client.setex(key, expire, serialized))
                 else:
                     # For complex objects, use pickle with caution
@@ -96,6 +117,37 @@ class CacheManager:
             logger.error(f"Cache set error for key '{key}': {e}")
             return False
     
+    def set_many(self, items: Dict[str, Any], expire: int = 3600) -> bool:
+        """
+        Set several values with one expiration, in a single Redis round trip.
+        
+        Args:
+            items: Mapping of cache key to value
+            expire: Expiration time in seconds
+            
+        Returns:
+            True if all values were stored, False otherwise
+        """
+        if not items:
+            return True
+        if not self.use_redis:
+            return all([self.set(key, value, expire) for key, value in items.items()])
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                if not key or not isinstance(key, str):
+                    logger.error(f"Invalid cache key: {key}")
+                    continue
+                if isinstance(value, (dict, list, str, int, float, bool)):
+                    pipe.setex(key, expire, _dumps(value))
+                else:
+                    pipe.setex(f"pickle:{key}", expire, pickle.dumps(value))
+            return all(pipe.execute())
+        except Exception as e:
+            logger.error(f"Cache set_many error for {len(items)} keys: {e}")
+            return False
+    
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache.
@@ -115,7 +167,7 @@ class CacheManager:
                 if data:
                     try:
                         # Try JSON first
-                        return json.loads(data)
+                        return _loads(data)
                     except json.JSONDecodeError:
                         # Fallback to pickle if it's a pickle key
                         if key.startswith("pickle:"):
@@ -139,6 +191,46 @@ class CacheManager:
             
         return None
     
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values, in a single Redis round trip for JSON values.
+        
+        Args:
+            keys: Cache keys
+        
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        keys = [key for key in keys if key and isinstance(key, str)]
+        if not keys:
+            return {}
+        if not self.use_redis:
+            values = {key: self.get(key) for key in keys}
+            return {key: value for key, value in values.items() if value is not None}
+        
+        results = {}
+        try:
+            missing = []
+            for key, data in zip(keys, self.redis_client.mget(keys)):
+                if data:
+                    try:
+                        results[key] = _loads(data)
+                        continue
+                    except json.JSONDecodeError:
+                        pass
+                missing.append(key)
+            
+            # Non-JSON values live under their pickle key variant
+            if missing:
+                pickled = self.redis_client.mget([f"pickle:{key}" for key in missing])
+                for key, data in zip(missing, pickled):
+                    if data:
+                        results[key] = pickle.loads(data)
+        except Exception as e:
+            logger.error(f"Cache get_many error for {len(keys)} keys: {e}")
+        
+        return results
+    
     def delete(self, key: str) -> bool:
         """
         Delete value from cache.
@@ -0,0 +1,54 @@
+"""
+Key Cached Dict for AST Visualizer
+Dict whose key tuple is reused across reads until its key set changes
+"""
+from typing import Optional
+
+
+class KeyCachedDict(dict):
+    """Dict that memoizes a tuple of its keys, rebuilt only after the key set changes."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._keys_tuple: Optional[tuple] = None
+    
+    @property
+    def keys_tuple(self) -> tuple:
+        """The current keys, in insertion order."""
+        if self._keys_tuple is None:
+            self._keys_tuple = tuple(self)
+        return self._keys_tuple
+    
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._keys_tuple = None
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._keys_tuple = None
+    
+    def __ior__(self, other):
+        self._keys_tuple = None
+        return super().__ior__(other)
+    
+    def pop(self, *args):
+        self._keys_tuple = None
+        return super().pop(*args)
+    
+    def popitem(self):
+        self._keys_tuple = None
+        return super().popitem()
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._keys_tuple = None
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        self._keys_tuple = None
+        super().update(*args, **kwargs)
+    
+    def clear(self):
+        self._keys_tuple = None
+        super().clear()
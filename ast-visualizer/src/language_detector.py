@@ -4,6 +4,7 @@ Language Detection and Routing for Multi-Language AST Analysis
 from pathlib import Path
 from typing import Optional, Set
 from enum import Enum
+from functools import lru_cache
 
 
 class Language(Enum):
@@ -102,8 +103,7 @@ class LanguageDetector:
         Returns:
             Detected language enum
         """
-        extension = file_path.suffix.lower()
-        return cls.EXTENSION_MAP.get(extension, Language.UNKNOWN)
+        return _language_for_suffix(file_path.suffix)
     
     @classmethod
     def is_supported(cls, language: Language) -> bool:
@@ -131,8 +131,7 @@ class LanguageDetector:
         Returns:
             True if file should be analyzed
         """
-        language = cls.detect_language(file_path)
-        return cls.is_supported(language)
+        return _analyzable_suffix(file_path.suffix)
     
     @classmethod
     def get_language_info(cls, file_path: Path) -> dict:
@@ -155,6 +154,18 @@ class LanguageDetector:
         }
 
 
+@lru_cache(maxsize=128)
+def _language_for_suffix(suffix: str) -> Language:
+    """Map a raw (not lowercased) file suffix to its language; memoized per suffix."""
+    return LanguageDetector.EXTENSION_MAP.get(suffix.lower(), Language.UNKNOWN)
+
+
+@lru_cache(maxsize=128)
+def _analyzable_suffix(suffix: str) -> bool:
+    """Whether files with this suffix are supported for AST analysis; memoized per suffix."""
+    return LanguageDetector.is_supported(_language_for_suffix(suffix))
+
+
 # Language-specific configuration
 LANGUAGE_CONFIG = {
     Language.PYTHON: {
@@ -2,7 +2,7 @@
 Project Model - Core data structures for hierarchical code navigation
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Dict, List, Optional, Set, Any, Tuple, Union
 from enum import Enum
 from pathlib import Path
 import json
@@ -34,7 +34,7 @@ class Scope(Enum):
     LOCAL = "local"
 
 
-@dataclass
+@dataclass(frozen=True)
 class CodeLocation:
     """Precise location of code element."""
     file_path: str
@@ -159,8 +159,20 @@ class ProjectGraph:
     # File tree structure
     file_tree: Dict[str, Any] = field(default_factory=dict)             # Hierarchical file tree
     
+    # Mutation counter and cache for derived views (charts etc.) keyed on it;
+    # elements already in the graph must be changed through its mutators
+    _version: int = field(default=0, repr=False, compare=False)
+    _derived_cache: Dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
+    
+    def _touch(self):
+        """Record a mutation: bump the version and drop views derived from the old one."""
+        self._version += 1
+        self._derived_cache.clear()
+        self.file_tree = {}
+    
     def add_element(self, element: CodeElement):
         """Add a code element to the project graph."""
+        self._touch()
         self.elements[element.id] = element
         self.languages.add(element.language)
         
@@ -205,6 +217,80 @@ class ProjectGraph:
             if parent:
                 parent.add_child(element.id)
     
+    def add_elements(self, elements: Dict[str, CodeElement]):
+        """
+        Add many code elements (keyed by ID) to the project graph in one call.
+        
+        Builds the same indexes as add_element, but links children to parents
+        after every element is in, so a child listed before its parent is
+        still linked.
+        """
+        self._touch()
+        self.elements.update(elements)
+        
+        files, packages = self.files, self.packages
+        named_indexes = {
+            NodeType.CLASS: self.classes,
+            NodeType.FUNCTION: self.functions,
+            NodeType.METHOD: self.functions,
+            NodeType.VARIABLE: self.variables,
+            NodeType.CONSTANT: self.variables,
+        }
+        by_type, by_language, by_file = self.by_type, self.by_language, self.by_file
+        dependency_graph, usage_graph = self.dependency_graph, self.usage_graph
+        
+        for element_id, element in elements.items():
+            element_type = element.type
+            file_path = element.location.file_path
+            
+            # Update hierarchical indexes
+            if element_type == NodeType.FILE:
+                files[file_path] = element_id
+            elif element_type == NodeType.PACKAGE:
+                packages[element.name] = element_id
+            else:
+                index = named_indexes.get(element_type)
+                if index is not None:
+                    index.setdefault(element.name, []).append(element_id)
+            
+            # Update type-based indexes
+            by_type.setdefault(element_type, set()).add(element_id)
+            by_language.setdefault(element.language, set()).add(element_id)
+            by_file.setdefault(file_path, set()).add(element_id)
+            
+            # Update dependency graphs
+            dependency_graph[element_id] = element.depends_on.copy()
+            usage_graph[element_id] = element.used_by.copy()
+        
+        self.languages.update(element.language for element in elements.values())
+        
+        # Update parent-child relationships
+        all_elements = self.elements
+        for element_id, element in elements.items():
+            if element.parent_id:
+                parent = all_elements.get(element.parent_id)
+                if parent:
+                    parent.add_child(element_id)
+    
+    def add_dependency(self, element_id: str, dependency_id: str):
+        """Record that an element in the graph depends on another."""
+        self._touch()
+        self.elements[element_id].add_dependency(dependency_id)
+        self.dependency_graph.setdefault(element_id, set()).add(dependency_id)
+    
+    def add_usage(self, element_id: str, user_id: str):
+        """Record that an element in the graph is used by another."""
+        self._touch()
+        self.elements[element_id].add_usage(user_id)
+        self.usage_graph.setdefault(element_id, set()).add(user_id)
+    
+    def update_element(self, element_id: str, **fields: Any):
+        """Set attributes (metrics, docstring, ...) of an element in the graph."""
+        self._touch()
+        element = self.elements[element_id]
+        for name, value in fields.items():
+            setattr(element, name, value)
+    
     def get_element(self, element_id: str) -> Optional[CodeElement]:
         """Get element by ID."""
         return self.elements.get(element_id)
@@ -349,6 +435,27 @@ class ProjectGraph:
             'file_tree': self.get_file_tree()
         }
     
+    def dep_stats(self) -> Tuple[int, int]:
+        """
+        Dependency counters: (total dependency edges, elements with dependencies).
+        
+        Computed once per graph version, so metrics requests do not rescan
+        the dependency graph; add_dependency and the other mutators bump the
+        version, so the counters follow every change made through them.
+        """
+        cached = self._derived_cache.get('dep_stats')
+        if cached and cached[0] == self._version:
+            return cached[1]
+        
+        total_edges = elements_with_deps = 0
+        for deps in self.dependency_graph.values():
+            if deps:
+                total_edges += len(deps)
+                elements_with_deps += 1
+        stats = (total_edges, elements_with_deps)
+        self._derived_cache['dep_stats'] = (self._version, stats)
+        return stats
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get project-level metrics."""
         return {
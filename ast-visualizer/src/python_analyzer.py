@@ -20,6 +20,27 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Node kinds reported without a name, keyed by exact AST type
+_UNNAMED_NODE_KINDS = {
+    ast.If: 'if_statement',
+    ast.For: 'for_loop',
+    ast.While: 'while_loop',
+    ast.With: 'with_statement',
+    ast.Try: 'try_statement',
+    ast.Lambda: 'lambda',
+    ast.ListComp: 'list_comprehension',
+    ast.DictComp: 'dict_comprehension',
+    ast.SetComp: 'set_comprehension',
+    ast.GeneratorExp: 'generator_expression',
+}
+# Types resolved by _get_node_info's named-node branches
+_NAMED_NODE_TYPES = frozenset({
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom,
+    ast.Assign, ast.AnnAssign, ast.AugAssign,
+})
+# Control flow types that add one to a node's complexity
+_CONTROL_FLOW_TYPES = frozenset({ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler})
+
 
 class PythonASTAnalyzer(LanguageAnalyzer):
     """Enhanced Python analyzer using built-in ast module."""
@@ -124,6 +145,15 @@ class PythonASTAnalyzer(LanguageAnalyzer):
             
             def _get_node_info(self, node: ast.AST) -> tuple[str, Optional[str]]:
                 """Get node type and name from Python AST node."""
+                # Dict/set lookups first: most nodes are of types we skip
+                node_class = type(node)
+                kind = _UNNAMED_NODE_KINDS.get(node_class)
+                if kind:
+                    return kind, None
+                if node_class not in _NAMED_NODE_TYPES:
+                    # Skip other node types for now
+                    return None, None
+                
                 if isinstance(node, ast.FunctionDef):
                     return 'function', node.name
                 elif isinstance(node, ast.AsyncFunctionDef):
@@ -149,28 +179,7 @@ class PythonASTAnalyzer(LanguageAnalyzer):
                     return 'annotated_assignment', node.target.id
                 elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
                     return 'augmented_assignment', node.target.id
-                elif isinstance(node, ast.If):
-                    return 'if_statement', None
-                elif isinstance(node, ast.For):
-                    return 'for_loop', None
-                elif isinstance(node, ast.While):
-                    return 'while_loop', None
-                elif isinstance(node, ast.With):
-                    return 'with_statement', None
-                elif isinstance(node, ast.Try):
-                    return 'try_statement', None
-                elif isinstance(node, ast.Lambda):
-                    return 'lambda', None
-                elif isinstance(node, ast.ListComp):
-                    return 'list_comprehension', None
-                elif isinstance(node, ast.DictComp):
-                    return 'dict_comprehension', None
-                elif isinstance(node, ast.SetComp):
-                    return 'set_comprehension', None
-                elif isinstance(node, ast.GeneratorExp):
-                    return 'generator_expression', None
                 else:
-                    # Skip other node types for now
                     return None, None
             
             def _get_attr_name(self, node: ast.Attribute) -> str:
@@ -184,14 +193,8 @@ class PythonASTAnalyzer(LanguageAnalyzer):
             
             def _calculate_node_complexity(self, node: ast.AST) -> Optional[int]:
                 """Calculate complexity for specific node types."""
-                # Control flow nodes add complexity
-                if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler)):
-                    return 1
-                elif isinstance(node, ast.FunctionDef):
-                    # Function complexity is handled separately
-                    return None
-                else:
-                    return None
+                # Control flow nodes add complexity; function complexity is handled separately
+                return 1 if type(node) in _CONTROL_FLOW_TYPES else None
             
             def _extract_node_properties(self, node: ast.AST) -> Dict[str, Any]:
                 """Extract additional properties from Python AST node."""
@@ -1,7 +1,7 @@
 """
 Navigation and Query Interface for Multi-Level Project Exploration
 """
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Callable, Dict, List, Optional, Set, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -48,9 +48,12 @@ class ViewData:
 class ProjectNavigator:
     """Provides navigation and querying capabilities for project graph."""
     
-    def __init__(self, project_graph: ProjectGraph):
+    def __init__(self, project_graph: ProjectGraph,
+                 on_context_change: Optional[Callable[[], None]] = None):
         self.graph = project_graph
         self.current_context = NavigationContext(current_level=ViewLevel.PROJECT)
+        # Called after navigation changes current_context, which every view embeds
+        self.on_context_change = on_context_change
     
     def get_project_overview(self) -> ViewData:
         """Get high-level project overview."""
@@ -289,7 +292,7 @@ class ProjectNavigator:
             elements = []
             title = "Project Dependencies"
             metrics = {
-                'total_dependencies': sum(len(deps) for deps in self.graph.dependency_graph.values()),
+                'total_dependencies': self.graph.dep_stats()[0],
                 'circular_dependencies': self._detect_circular_dependencies()
             }
             relationships = dict(self.graph.dependency_graph)
@@ -347,6 +350,8 @@ class ProjectNavigator:
         # Update navigation context
         self.current_context.current_element_id = element_id
         self.current_context.breadcrumb.append(element_id)
+        if self.on_context_change is not None:
+            self.on_context_change()
         
         # Return appropriate view based on element type
         if element.type == NodeType.PROJECT:
@@ -4,6 +4,7 @@ Visualization Adapters for Different Chart Types and Data Presentations
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
+from functools import wraps
 
 from models.project_model import ProjectGraph, CodeElement, NodeType
 from .navigation import ViewData, ViewLevel
@@ -23,9 +24,9 @@ class ChartType(Enum):
     TIMELINE = "timeline"           # Time-based visualization
 
 
-@dataclass
+@dataclass(frozen=True)
 class ChartData:
-    """Data structure for chart visualization."""
+    """Data structure for chart visualization (frozen: memoized charts are shared)."""
     chart_type: ChartType
     title: str
     data: Dict[str, Any]           # Chart-specific data format
@@ -34,12 +35,35 @@ class ChartData:
     metadata: Dict[str, Any]       # Additional metadata
 
 
+def _cached_by_graph_version(method):
+    """
+    Memoize a chart getter's unfiltered call on the graph, invalidated when the
+    graph version changes. Filtered calls (ids and names from query strings)
+    are computed each time, so clients cannot grow the cache without bound.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if any(arg is not None for arg in args) or any(value is not None for value in kwargs.values()):
+            return method(self, *args, **kwargs)
+        
+        key = method.__name__
+        cached = self.graph._derived_cache.get(key)
+        if cached and cached[0] == self.graph._version:
+            return list(cached[1])
+        
+        charts = method(self, *args, **kwargs)
+        self.graph._derived_cache[key] = (self.graph._version, charts)
+        return list(charts)
+    return wrapper
+
+
 class VisualizationAdapter:
     """Converts project data into various visualization formats."""
     
     def __init__(self, project_graph: ProjectGraph):
         self.graph = project_graph
     
+    @_cached_by_graph_version
     def get_project_overview_charts(self) -> List[ChartData]:
         """Get charts for project overview."""
         charts = []
@@ -58,6 +82,7 @@ class VisualizationAdapter:
         
         return charts
     
+    @_cached_by_graph_version
     def get_file_level_charts(self, file_id: Optional[str] = None) -> List[ChartData]:
         """Get charts for file-level analysis."""
         charts = []
@@ -73,6 +98,7 @@ class VisualizationAdapter:
         
         return charts
     
+    @_cached_by_graph_version
     def get_class_level_charts(self, class_filter: Optional[str] = None) -> List[ChartData]:
         """Get charts for class-level analysis."""
         charts = []
@@ -88,6 +114,7 @@ class VisualizationAdapter:
         
         return charts
     
+    @_cached_by_graph_version
     def get_dependency_charts(self, element_id: Optional[str] = None) -> List[ChartData]:
         """Get dependency visualization charts."""
         charts = []
@@ -103,6 +130,10 @@ class VisualizationAdapter:
     
     def _create_language_distribution_chart(self) -> ChartData:
         """Create language distribution pie chart."""
+        empty = self._ensure_files_or_empty("Language Distribution")
+        if empty:
+            return empty
+        
         language_counts = {}
         for element in self.graph.elements.values():
             if element.type == NodeType.FILE:
@@ -134,6 +165,10 @@ class VisualizationAdapter:
     
     def _create_file_tree_chart(self) -> ChartData:
         """Create hierarchical file tree."""
+        empty = self._ensure_files_or_empty("Project File Tree")
+        if empty:
+            return empty
+        
         tree_data = self.graph.get_file_tree()
         
         # Convert to hierarchical format for visualization
@@ -158,6 +193,10 @@ class VisualizationAdapter:
     
     def _create_complexity_heatmap(self) -> ChartData:
         """Create complexity heatmap by file."""
+        empty = self._ensure_files_or_empty("Complexity Heatmap")
+        if empty:
+            return empty
+        
         files_data = []
         for file_path, file_id in self.graph.files.items():
             file_element = self.graph.get_element(file_id)
@@ -190,6 +229,10 @@ class VisualizationAdapter:
     
     def _create_dependency_network(self) -> ChartData:
         """Create dependency network graph."""
+        empty = self._ensure_files_or_empty("File Dependencies")
+        if empty:
+            return empty
+        
         nodes = []
         edges = []
         
@@ -298,6 +341,10 @@ class VisualizationAdapter:
     
     def _create_files_treemap(self) -> ChartData:
         """Create treemap of all files sized by lines of code."""
+        empty = self._ensure_files_or_empty("Files by Size")
+        if empty:
+            return empty
+        
         treemap_data = []
         
         for element in self.graph.elements.values():
@@ -328,6 +375,10 @@ class VisualizationAdapter:
     
     def _create_files_metrics_chart(self) -> ChartData:
         """Create scatter plot of files by complexity vs size."""
+        empty = self._ensure_files_or_empty("Files: Complexity vs Size")
+        if empty:
+            return empty
+        
         scatter_data = []
         
         for element in self.graph.elements.values():
@@ -360,6 +411,10 @@ class VisualizationAdapter:
     
     def _create_files_language_breakdown(self) -> ChartData:
         """Create language breakdown bar chart."""
+        empty = self._ensure_files_or_empty("Language Breakdown")
+        if empty:
+            return empty
+        
         language_data = {}
         
         for element in self.graph.elements.values():
@@ -415,6 +470,10 @@ class VisualizationAdapter:
     
     def _create_global_dependency_network(self) -> ChartData:
         """Create comprehensive dependency network."""
+        empty = self._ensure_files_or_empty("Global Dependency Network")
+        if empty:
+            return empty
+        
         nodes = []
         edges = []
         
@@ -463,28 +522,38 @@ class VisualizationAdapter:
         """Convert tree data to visualization format."""
         nodes = []
         
-        for name, item in tree_data.items():
-            node_id = f"{parent_id}/{name}" if parent_id else name
+        # Iterative pre-order walk; ids are kept as path-part tuples and joined once per node
+        root_parts = (parent_id,) if parent_id else ()
+        stack = [(root_parts, parent_id, iter(tree_data.items()))]
+        
+        while stack:
+            parts, current_parent, items = stack[-1]
+            entry = next(items, None)
+            if entry is None:
+                stack.pop()
+                continue
+            
+            name, item = entry
+            node_parts = parts + (name,)
+            node_id = '/'.join(node_parts)
             
             if item.get('type') == 'directory':
+                children = item.get('children', {})
                 nodes.append({
                     'id': node_id,
                     'name': name,
                     'type': 'directory',
-                    'parent': parent_id,
-                    'children': len(item.get('children', {}))
+                    'parent': current_parent,
+                    'children': len(children)
                 })
-                # Recursively add children
-                nodes.extend(self._convert_tree_to_vis_format(
-                    item.get('children', {}), 
-                    node_id
-                ))
+                # Descend into children before continuing with siblings
+                stack.append((node_parts, node_id, iter(children.items())))
             else:
                 nodes.append({
                     'id': node_id,
                     'name': name,
                     'type': 'file',
-                    'parent': parent_id,
+                    'parent': current_parent,
                     'language': item.get('language'),
                     'lines_of_code': item.get('lines_of_code', 0),
                     'complexity': item.get('complexity', 0),
@@ -585,6 +654,12 @@ class VisualizationAdapter:
         
         return groups
     
+    def _ensure_files_or_empty(self, title: str) -> Optional[ChartData]:
+        """Return an empty chart when the project has no files, otherwise None."""
+        if self.graph.by_type.get(NodeType.FILE):
+            return None
+        return self._create_empty_chart(f"{title}: no files analyzed")
+    
     def _create_empty_chart(self, message: str) -> ChartData:
         """Create empty chart with message."""
         return ChartData(
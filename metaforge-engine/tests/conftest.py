@@ -0,0 +1,76 @@
+"""
+Shared fixtures for the test suite
+"""
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# Source for the sample repository analyzed by integration tests
+SAMPLE_SRC = '''
+import os
+import sys
+
+class TestClass:
+    """A test class."""
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def calculate(self, x):
+        """Calculate something."""
+        if x > 0:
+            return self.value * x
+        else:
+            return 0
+
+def main():
+    """Main function."""
+    obj = TestClass(42)
+    result = obj.calculate(10)
+    print(f"Result: {result}")
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+@pytest.fixture(scope="session")
+def app_instance():
+    """Import the Flask app once per session, configured for testing."""
+    # Set required environment variable before the app module is imported
+    os.environ.setdefault('SECRET_KEY', 'test-secret-key-for-testing')
+    from app import app
+    
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app_instance):
+    """Create one test client shared by every test."""
+    with app_instance.test_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def _analyzer_mock():
+    """Build the analyzer mock once; mock_analyzer resets it per test."""
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_analyzer(app_instance, _analyzer_mock):
+    """Swap the shared analyzer mock into the app for one test."""
+    _analyzer_mock.reset_mock(return_value=True, side_effect=True)
+    with patch('app.analyzer', _analyzer_mock):
+        yield _analyzer_mock
+
+
+@pytest.fixture(scope="session")
+def sample_repo(tmp_path_factory):
+    """Write the sample repository once per session."""
+    repo = tmp_path_factory.mktemp("repo")
+    (repo / 'test_module.py').write_text(SAMPLE_SRC)
+    return str(repo)
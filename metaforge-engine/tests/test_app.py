@@ -1,92 +1,124 @@
 """
 Tests for Flask application
 """
-import pytest
+import gzip
 import json
+import pytest
 import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch
 import os
+from pathlib import Path
+
+# Well-formed analysis ID that is never stored
+VALID_BUT_UNKNOWN_ID = '00000000-0000-4000-8000-000000000000'
+# Analysis ID a project graph is built under by integration tests
+PROJECT_ID = '11111111-1111-4111-8111-111111111111'
+
+# Error message fragments the API promises to return
+ERR_INVALID_ID = 'Invalid analysis ID'
+ERR_INVALID_ID_B = ERR_INVALID_ID.encode()
+ERR_PATH_OR_URL = 'path or URL'
+ERR_BOTH_PATH_AND_URL = 'either path or URL'
+ERR_NOT_FOUND = 'not found'
+ERR_QUERY_TOO_LONG = 'Query too long'
+ERR_INVALID_NODE_TYPE = 'Invalid node type'
+ERR_SECURITY = 'Security validation failed'
+ERR_RATE_LIMIT = 'Rate limit exceeded'
+
+# Request bodies and canned analyzer results shared by tests (never mutated)
+URL_BODY = {'url': 'https://github.com/test/repo.git'}
+DUAL_BODY = {'path': '/test/path', 'url': 'https://github.com/test/repo.git'}
+
+LOCAL_ANALYSIS_RESULT = {
+    'summary': {
+        'total_files': 5,
+        'total_lines': 1000,
+        'total_classes': 3,
+        'total_functions': 15
+    },
+    'files': ['file1.py', 'file2.py'],
+    'metrics': {},
+    'analysis_time': 2.5
+}
 
-# Set required environment variable for testing
-os.environ['SECRET_KEY'] = 'test-secret-key-for-testing'
+URL_ANALYSIS_RESULT = {
+    'summary': {
+        'total_files': 3,
+        'total_lines': 500
+    },
+    'files': ['main.py'],
+    'metrics': {},
+    'analysis_time': 1.8
+}
 
-from app import app
+
+def assert_error(response, status, substr):
+    """Assert an error response with the given status and message fragment."""
+    assert response.status_code == status
+    data = response.get_json()
+    assert data and substr in data.get('error', '')
+    return data
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits(app_instance):
+    """Clear per-client request counts so tests don't depend on run order."""
+    import app
+    app.request_counts.clear()
 
 
 class TestFlaskApp:
     """Test Flask application endpoints."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    
-    @pytest.fixture
-    def mock_analyzer(self):
-        """Create mock analyzer."""
-        with patch('app.analyzer') as mock:
-            yield mock
-    
     def test_index_page(self, client):
         """Test index page loads."""
         response = client.get('/')
         assert response.status_code == 200
-        assert b'AST Repository Visualizer' in response.data
+        assert b'AST Repository Visualizer' in response.get_data()
     
     def test_health_check(self, client):
         """Test health check endpoint."""
         response = client.get('/health')
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['status'] == 'healthy'
         assert 'timestamp' in data
         assert 'cache' in data
         assert 'version' in data
     
-    def test_analyze_missing_data(self, client):
-        """Test analyze endpoint with missing data."""
-        response = client.post('/api/analyze', json={})
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'path or URL' in data['error']
-    
-    def test_analyze_both_path_and_url(self, client):
-        """Test analyze endpoint with both path and URL."""
-        response = client.post('/api/analyze', json={
-            'path': '/test/path',
-            'url': 'https://github.com/test/repo.git'
-        })
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'either path or URL' in data['error']
+    @pytest.mark.parametrize("method,url,json_body,status,substr", [
+        pytest.param('POST', '/api/analyze', {}, 400, ERR_PATH_OR_URL,
+                     id='analyze_missing_data'),
+        pytest.param('POST', '/api/analyze', DUAL_BODY, 400, ERR_BOTH_PATH_AND_URL,
+                     id='analyze_both_path_and_url'),
+        pytest.param('GET', '/api/visualize/invalid-id', None, 400, ERR_INVALID_ID,
+                     id='visualize_invalid_id'),
+        pytest.param('GET', f'/api/visualize/{VALID_BUT_UNKNOWN_ID}', None, 404, ERR_NOT_FOUND,
+                     id='visualize_not_found'),
+        pytest.param('GET', '/api/search/invalid-id?q=test', None, 400, ERR_INVALID_ID,
+                     id='search_invalid_id'),
+        # Query exceeds the 100 character limit
+        pytest.param('GET', f'/api/search/{VALID_BUT_UNKNOWN_ID}?q={"x" * 101}', None, 400,
+                     ERR_QUERY_TOO_LONG, id='search_query_too_long'),
+        pytest.param('GET', f'/api/search/{VALID_BUT_UNKNOWN_ID}?type=InvalidType', None, 400,
+                     ERR_INVALID_NODE_TYPE, id='search_invalid_node_type'),
+        pytest.param('GET', '/api/export/invalid-id', None, 400, ERR_INVALID_ID,
+                     id='export_invalid_id'),
+    ])
+    def test_error_cases(self, client, method, url, json_body, status, substr):
+        """Test endpoints reject invalid requests with an error message."""
+        response = client.open(url, method=method, json=json_body)
+        assert_error(response, status, substr)
     
     def test_analyze_local_success(self, client, mock_analyzer):
         """Test successful local analysis."""
-        mock_analyzer.analyze_local.return_value = {
-            'summary': {
-                'total_files': 5,
-                'total_lines': 1000,
-                'total_classes': 3,
-                'total_functions': 15
-            },
-            'files': ['file1.py', 'file2.py'],
-            'metrics': {},
-            'analysis_time': 2.5
-        }
+        mock_analyzer.analyze_local.return_value = LOCAL_ANALYSIS_RESULT
         
         with tempfile.TemporaryDirectory() as tmpdir:
             response = client.post('/api/analyze', json={'path': tmpdir})
             assert response.status_code == 200
             
-            data = json.loads(response.data)
+            data = response.get_json()
             assert 'analysis_id' in data
             assert data['summary']['total_files'] == 5
             assert 'files' in data
@@ -94,22 +126,12 @@ class TestFlaskApp:
     
     def test_analyze_url_success(self, client, mock_analyzer):
         """Test successful URL analysis."""
-        mock_analyzer.analyze_from_url.return_value = {
-            'summary': {
-                'total_files': 3,
-                'total_lines': 500
-            },
-            'files': ['main.py'],
-            'metrics': {},
-            'analysis_time': 1.8
-        }
+        mock_analyzer.analyze_from_url.return_value = URL_ANALYSIS_RESULT
         
-        response = client.post('/api/analyze', json={
-            'url': 'https://github.com/test/repo.git'
-        })
+        response = client.post('/api/analyze', json=URL_BODY)
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = response.get_json()
         assert 'analysis_id' in data
         assert data['summary']['total_files'] == 3
     
@@ -119,98 +141,32 @@ class TestFlaskApp:
         mock_analyzer.analyze_local.side_effect = SecurityError("Invalid path")
         
         response = client.post('/api/analyze', json={'path': '/invalid/path'})
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Security validation failed' in data['error']
-    
-    def test_visualize_invalid_id(self, client):
-        """Test visualization with invalid analysis ID."""
-        response = client.get('/api/visualize/invalid-id')
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Invalid analysis ID' in data['error']
-    
-    def test_visualize_not_found(self, client):
-        """Test visualization with non-existent analysis."""
-        import uuid
-        valid_id = str(uuid.uuid4())
-        
-        response = client.get(f'/api/visualize/{valid_id}')
-        assert response.status_code == 404
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'not found' in data['error']
-    
-    def test_search_invalid_id(self, client):
-        """Test search with invalid analysis ID."""
-        response = client.get('/api/search/invalid-id?q=test')
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Invalid analysis ID' in data['error']
-    
-    def test_search_query_too_long(self, client):
-        """Test search with query that's too long."""
-        import uuid
-        valid_id = str(uuid.uuid4())
-        long_query = 'x' * 101  # Exceeds 100 character limit
-        
-        response = client.get(f'/api/search/{valid_id}?q={long_query}')
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Query too long' in data['error']
-    
-    def test_search_invalid_node_type(self, client):
-        """Test search with invalid node type."""
-        import uuid
-        valid_id = str(uuid.uuid4())
-        
-        response = client.get(f'/api/search/{valid_id}?type=InvalidType')
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Invalid node type' in data['error']
+        assert_error(response, 400, ERR_SECURITY)
     
     def test_status_endpoint(self, client):
         """Test status endpoint."""
         response = client.get('/api/status')
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data['status'] == 'running'
         assert 'cache' in data
         assert 'configuration' in data
     
-    def test_export_invalid_id(self, client):
-        """Test export with invalid analysis ID."""
-        response = client.get('/api/export/invalid-id')
-        assert response.status_code == 400
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert 'Invalid analysis ID' in data['error']
-    
     def test_visualization_page_invalid_id(self, client):
         """Test visualization page with invalid ID."""
         response = client.get('/visualization/invalid-id')
         assert response.status_code == 400
-        assert b'Invalid analysis ID' in response.data
+        assert ERR_INVALID_ID_B in response.data
     
     def test_rate_limiting(self, client):
-        """Test rate limiting functionality."""
-        # This test would need to be adjusted based on actual rate limits
-        # For now, just verify the endpoint works
-        response = client.get('/health')
-        assert response.status_code == 200
+        """Test requests beyond the per-client limit are rejected."""
+        from app import RATE_LIMIT_REQUESTS
+        
+        for _ in range(RATE_LIMIT_REQUESTS):
+            assert client.get('/api/status').status_code == 200
+        
+        assert_error(client.get('/api/status'), 429, ERR_RATE_LIMIT)
     
     def test_security_headers(self, client):
         """Test that security headers are present."""
@@ -225,12 +181,12 @@ class TestFlaskApp:
     
     def test_content_length_limit(self, client):
         """Test content length limit."""
-        # Create a large payload
-        large_data = {'data': 'x' * (100 * 1024 * 1024 + 1)}  # Larger than MAX_FILE_SIZE
-        
-        response = client.post('/api/analyze', 
-                              data=json.dumps(large_data),
-                              content_type='application/json')
+        # Send a small body under an oversized Content-Length; the request is
+        # rejected on the header, so the full payload is never materialized
+        response = client.post('/api/analyze',
+                              data=b'x' * 8192,
+                              content_type='application/json',
+                              environ_overrides={'CONTENT_LENGTH': str(100 * 1024 * 1024 + 1)})
         
         # Should be rejected due to content length
         assert response.status_code == 413
@@ -244,74 +200,63 @@ class TestFlaskApp:
 class TestIntegration:
     """Integration tests with real file analysis."""
     
-    @pytest.fixture
-    def client(self):
-        """Create test client."""
-        app.config['TESTING'] = True
-        with app.test_client() as client:
-            yield client
-    
-    def test_full_analysis_workflow(self, client):
+    def test_full_analysis_workflow(self, client, sample_repo):
         """Test complete analysis workflow with real files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test Python files
-            test_file = Path(tmpdir) / 'test_module.py'
-            test_file.write_text('''
-import os
-import sys
-
-class TestClass:
-    """A test class."""
-    
-    def __init__(self, value):
-        self.value = value
-    
-    def calculate(self, x):
-        """Calculate something."""
-        if x > 0:
-            return self.value * x
-        else:
-            return 0
-
-def main():
-    """Main function."""
-    obj = TestClass(42)
-    result = obj.calculate(10)
-    print(f"Result: {result}")
-
-if __name__ == "__main__":
-    main()
-''')
+        # Start analysis
+        response = client.post('/api/analyze', json={'path': sample_repo})
+        
+        if response.status_code == 200:
+            data = response.get_json()
+            analysis_id = data['analysis_id']
             
-            # Start analysis
-            response = client.post('/api/analyze', json={'path': tmpdir})
+            # Check summary
+            assert data['summary']['total_files'] >= 1
+            assert data['summary']['total_classes'] >= 1
+            assert data['summary']['total_functions'] >= 2
+            
+            # Test visualization endpoint
+            viz_response = client.get(f'/api/visualize/{analysis_id}')
+            if viz_response.status_code == 200:
+                viz_data = viz_response.get_json()
+                assert 'nodes' in viz_data
+                assert 'edges' in viz_data
+                assert len(viz_data['nodes']) >= 1
             
-            if response.status_code == 200:
-                data = json.loads(response.data)
-                analysis_id = data['analysis_id']
-                
-                # Check summary
-                assert data['summary']['total_files'] >= 1
-                assert data['summary']['total_classes'] >= 1
-                assert data['summary']['total_functions'] >= 2
-                
-                # Test visualization endpoint
-                viz_response = client.get(f'/api/visualize/{analysis_id}')
-                if viz_response.status_code == 200:
-                    viz_data = json.loads(viz_response.data)
-                    assert 'nodes' in viz_data
-                    assert 'edges' in viz_data
-                    assert len(viz_data['nodes']) >= 1
-                
-                # Test search endpoint
-                search_response = client.get(f'/api/search/{analysis_id}?q=TestClass')
-                if search_response.status_code == 200:
-                    search_data = json.loads(search_response.data)
-                    assert 'results' in search_data
-                
-                # Test visualization page
-                page_response = client.get(f'/visualization/{analysis_id}')
-                assert page_response.status_code == 200
+            # Test search endpoint
+            search_response = client.get(f'/api/search/{analysis_id}?q=TestClass')
+            if search_response.status_code == 200:
+                search_data = search_response.get_json()
+                assert 'results' in search_data
+            
+            # Test visualization page
+            page_response = client.get(f'/visualization/{analysis_id}')
+            assert page_response.status_code == 200
+    
+    def test_project_metrics_stream(self, client, sample_repo):
+        """Test the streamed project metrics body is one well-formed, gzipped JSON document."""
+        import app as app_module
+        from analyzers.project_builder import ProjectBuilder
+        from views.navigation import ProjectNavigator
+        
+        graph = ProjectBuilder().build_project('sample', Path(sample_repo), PROJECT_ID)
+        app_module.project_graphs[PROJECT_ID] = graph
+        app_module.project_navigators[PROJECT_ID] = ProjectNavigator(graph)
+        try:
+            response = client.get(f'/api/v2/project/{PROJECT_ID}/metrics',
+                                  headers={'Accept-Encoding': 'gzip'})
+            
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.headers['Content-Encoding'] == 'gzip'
+            data = json.loads(gzip.decompress(response.get_data()))
+            assert data['status'] == 'success'
+            assert data['data']['basic_metrics']['total_files'] == 1
+            assert set(data['data']['detailed_metrics']) == {
+                'complexity_stats', 'dependency_stats', 'file_tree', 'language_breakdown'
+            }
+        finally:
+            app_module.project_graphs.pop(PROJECT_ID, None)
+            app_module.project_navigators.pop(PROJECT_ID, None)
 
 
 if __name__ == '__main__':
@@ -205,6 +205,92 @@ def broken_function(
             finally:
                 os.unlink(f.name)
     
+    def test_analyze_file_fingerprint_cache(self):
+        """Test byte-identical files are served from the fingerprint cache."""
+        store = {}
+        self.cache_mock.get.side_effect = store.get
+        self.cache_mock.set.side_effect = lambda key, value, expire=None: store.__setitem__(key, value)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = Path(tmpdir) / 'first.py'
+            second = Path(tmpdir) / 'second.py'
+            first.write_text('def func(x):\n    return x\n')
+            second.write_text('def func(x):\n    return x\n')
+            
+            result1 = self.analyzer._analyze_file(first, 'test_analysis')
+            assert any(key.startswith('fa:') for key in store)
+            
+            with patch('ast.parse', side_effect=AssertionError('file was re-parsed')):
+                result2 = self.analyzer._analyze_file(second, 'test_analysis')
+            
+            assert result2 is not None
+            assert result2.path == str(second)
+            assert result2.functions == result1.functions
+            assert all(node.file == str(second) for node in result2.nodes)
+            
+            # Rebound node ids match a fresh analysis of the new path, and never
+            # collide with the original file's ids
+            ids1 = {node.id for node in result1.nodes}
+            ids2 = {node.id for node in result2.nodes}
+            assert ids1.isdisjoint(ids2)
+            assert all(set(node.children) <= ids2 for node in result2.nodes)
+            
+            store.clear()
+            fresh = self.analyzer._analyze_file(second, 'test_analysis')
+            assert [(n.id, n.children) for n in fresh.nodes] == [(n.id, n.children) for n in result2.nodes]
+    
+    def test_analyze_local_reuses_unchanged_files(self):
+        """Test files listed in the reuse map are loaded from cache without being read."""
+        store = {}
+        self.cache_mock.get.side_effect = store.get
+        self.cache_mock.set.side_effect = lambda key, value, expire=None: store.__setitem__(key, value)
+        self.cache_mock.set_many.side_effect = lambda items, expire=None: store.update(items)
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ('a.py', 'b.py'):
+                (Path(tmpdir) / name).write_text(f'def {name[0]}():\n    return 1\n')
+            
+            self.analyzer.analyze_local(tmpdir, 'first')
+            fingerprints = store['fingerprints:first']
+            assert sorted(fingerprints) == ['a.py', 'b.py']
+            
+            reuse = {str(Path(tmpdir) / 'a.py'): fingerprints['a.py']}
+            read_bytes = self.analyzer._read_bytes_safely
+            with patch.object(self.analyzer, '_read_bytes_safely', side_effect=read_bytes) as mock_read:
+                result = self.analyzer.analyze_local(tmpdir, 'second', reuse)
+            
+            assert [call.args[0].name for call in mock_read.call_args_list] == ['b.py']
+            assert sorted(Path(f).name for f in result['files']) == ['a.py', 'b.py']
+            assert store['fingerprints:second'] == fingerprints
+    
+    def test_fingerprint_filter_skips_unknown_keys(self):
+        """Test fingerprint keys absent from the Bloom filter never reach the cache."""
+        self.cache_mock.get.reset_mock()
+        
+        assert self.analyzer._load_fingerprint('fa:unknown:.py', Path('unknown.py')) is None
+        self.cache_mock.get.assert_not_called()
+        
+        self.analyzer._fingerprint_filter.add('fa:known:.py')
+        self.cache_mock.get.return_value = None
+        assert self.analyzer._load_fingerprint('fa:known:.py', Path('known.py')) is None
+        self.cache_mock.get.assert_called_once_with('fa:known:.py')
+    
+    def test_fingerprint_filter_merges_other_writers(self):
+        """Test a filter miss picks up fingerprints another analyzer saved since loading."""
+        store = {}
+        self.cache_mock.get.side_effect = store.get
+        self.cache_mock.set.side_effect = lambda key, value, expire=None: store.__setitem__(key, value)
+        reader = RepositoryAnalyzer(self.cache_mock)
+        
+        self.analyzer._fingerprint_filter.add('fa:shared:.py')
+        self.analyzer._fingerprint_filter_dirty = True
+        self.analyzer._persist_fingerprint_filter()
+        
+        reader._fingerprint_filter_checked -= reader.FINGERPRINT_FILTER_REFRESH_INTERVAL
+        assert reader._load_fingerprint('fa:shared:.py', Path('shared.py')) is None
+        assert 'fa:shared:.py' in reader._fingerprint_filter
+        assert reader._fingerprint_filter_version == store[reader.FINGERPRINT_FILTER_VERSION_KEY]
+    
     def test_complexity_calculation(self):
         """Test complexity calculation."""
         simple_code = 'print("hello")'
@@ -339,6 +425,26 @@ def complex_function(x):
         assert 'type' in node
         assert 'metrics' in node
     
+    def test_prepare_visualization_memoized_per_analysis(self):
+        """Test chunked visualizations are built once per analysis id."""
+        store = {
+            'files:viz_analysis:_count': 1,
+            'files:viz_analysis:0': self.analyzer._files_to_columns([
+                FileAnalysis('pkg/a.py', [], [], [], ['f'], 2.0, 10, 'abcdef0123', 100)
+            ])
+        }
+        self.cache_mock.get.side_effect = store.get
+        self.cache_mock.get_many.side_effect = lambda keys: {k: store[k] for k in keys if k in store}
+        self.cache_mock.set.side_effect = lambda key, value, expire=None: store.__setitem__(key, value)
+        
+        viz_data = self.analyzer.prepare_visualization({'summary': {}}, 'viz_analysis')
+        assert [node['label'] for node in viz_data['nodes']] == ['a.py']
+        assert store['viz:viz_analysis'] is viz_data
+        
+        self.cache_mock.get_many.reset_mock()
+        assert self.analyzer.prepare_visualization({'summary': {}}, 'viz_analysis') is viz_data
+        self.cache_mock.get_many.assert_not_called()
+    
     def test_search_nodes(self):
         """Test node searching functionality."""
         # Mock cache with analysis data
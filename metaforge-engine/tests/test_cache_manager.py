@@ -144,6 +144,41 @@ class TestCacheManager:
             # Verify it's valid JSON
             json.loads(args[2])
     
+    def test_set_many_uses_single_pipeline(self):
+        """Test batched writes go through one Redis pipeline."""
+        mock_redis_client = Mock()
+        mock_pipeline = Mock()
+        
+        with patch('redis.from_url') as mock_redis:
+            mock_redis.return_value = mock_redis_client
+            mock_redis_client.ping.return_value = True
+            mock_redis_client.pipeline.return_value = mock_pipeline
+            mock_pipeline.execute.return_value = [True, True]
+            
+            cache = CacheManager()
+            
+            assert cache.set_many({'key1': {'a': 1}, 'key2': [1, 2]}, expire=60)
+            
+            mock_redis_client.pipeline.assert_called_once()
+            assert mock_pipeline.setex.call_count == 2
+            mock_pipeline.execute.assert_called_once()
+            mock_redis_client.setex.assert_not_called()
+    
+    def test_get_many_uses_single_mget(self):
+        """Test batched reads fetch JSON values with one MGET."""
+        mock_redis_client = Mock()
+        
+        with patch('redis.from_url') as mock_redis:
+            mock_redis.return_value = mock_redis_client
+            mock_redis_client.ping.return_value = True
+            mock_redis_client.mget.return_value = [b'{"a":1}', b'[1,2]']
+            
+            cache = CacheManager()
+            
+            assert cache.get_many(['key1', 'key2']) == {'key1': {'a': 1}, 'key2': [1, 2]}
+            mock_redis_client.mget.assert_called_once_with(['key1', 'key2'])
+            mock_redis_client.get.assert_not_called()
+    
     @patch('redis.from_url')
     def test_redis_connection_success(self, mock_redis):
         """Test successful Redis connection."""
@@ -0,0 +1,74 @@
+"""
+Tests for analyzers/project_builder.py and the project graph it builds
+"""
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+from analyzers.project_builder import ProjectBuilder
+from models.project_model import ProjectGraph, CodeElement, CodeLocation, NodeType
+
+
+def _file_element(path: str) -> CodeElement:
+    """A file element for path, as the hierarchy analyzer would create it."""
+    return CodeElement(
+        id=f"file:{path}",
+        name=path.rsplit('/', 1)[-1],
+        type=NodeType.FILE,
+        language='python',
+        location=CodeLocation(path, 1, 1, 0, 0)
+    )
+
+
+class TestProjectGraph:
+    """Test project graph mutation and derived views."""
+    
+    def test_dep_stats_follow_dependency_mutations(self):
+        """Test dependency counters are recomputed after the graph changes."""
+        graph = ProjectGraph(project_id='p', name='p', root_path='/p')
+        a, b = _file_element('/p/a.py'), _file_element('/p/b.py')
+        graph.add_elements({a.id: a, b.id: b})
+        assert graph.dep_stats() == (0, 0)
+        
+        graph.add_dependency(a.id, b.id)
+        assert graph.dep_stats() == (1, 1)
+        assert graph.get_element(a.id).depends_on == {b.id}
+        
+        graph.add_dependency(b.id, a.id)
+        assert graph.dep_stats() == (2, 2)
+
+
+class TestProjectBuilder:
+    """Test building a project graph from a source tree."""
+    
+    def test_build_project_links_imported_files(self, tmp_path):
+        """Test a file importing another gets a dependency on it, plus file metrics."""
+        (tmp_path / 'app.py').write_text('import helpers\n\n\ndef main():\n    return helpers.VALUE\n')
+        (tmp_path / 'helpers.py').write_text('VALUE = 1\n')
+        
+        graph = ProjectBuilder().build_project('demo', tmp_path, 'test_analysis')
+        
+        app_file = graph.get_element('file:app.py')
+        assert app_file.depends_on == {'file:helpers.py'}
+        assert graph.dependency_graph['file:app.py'] == {'file:helpers.py'}
+        assert graph.get_element('file:helpers.py').depends_on == set()
+        assert app_file.lines_of_code >= 5
+    
+    def test_cached_analyses_never_shared_by_namesakes(self, tmp_path):
+        """Test same-named files in different directories each get their own cached analysis."""
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'a.py').write_text('def top():\n    pass\n')
+        (tmp_path / 'src' / 'a.py').write_text('def nested():\n    pass\n')
+        nested_key = f"file:test_analysis:{os.path.join('src', 'a.py')}"
+        store = {nested_key: {'path': str(tmp_path / 'src' / 'a.py'), 'language': 'python',
+                              'functions': ['nested']}}
+        cache_manager = Mock()
+        cache_manager.get_many.side_effect = lambda keys: {k: store[k] for k in keys if k in store}
+        builder = ProjectBuilder(cache_manager=cache_manager)
+        
+        analyses = builder._retrieve_cached_analyses(builder._discover_files(tmp_path), 'test_analysis', tmp_path)
+        
+        assert analyses[str(tmp_path / 'src' / 'a.py')].functions == ['nested']
+        assert analyses[str(tmp_path / 'a.py')].functions == ['top']
+        assert not builder._cached_for_file({'path': '/repo/src/a.py'}, '/repo/a.py', 'a.py', Path('/repo'))
+        assert not builder._cached_for_file({}, '/repo/a.py', 'a.py', Path('/repo'))